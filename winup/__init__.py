@@ -2,7 +2,8 @@ from .core.window import _winup_app, Window
 from .core.component import component
 from .core.events import event_bus as events
 from .core.hot_reload import hot_reload_service, _import_from_string
-from .core.memoize import memo, clear_memo_cache
+from .core.memoize import memo, clear_memo_cache, configure_memo
+from .core.pool import configure_widget_pool
 from typing import Optional
 
 from . import ui
@@ -143,6 +144,6 @@ def run(main_component_path: str, title="WinUp App", width=800, height=600, icon
 __all__ = [
     "run", "Window", "hot_reload_service", "events", 
     "ui", "style", "state", "tools", "wintools", "profiler",
-    "component", "memo", "clear_memo_cache",
+    "component", "memo", "clear_memo_cache", "configure_memo", "configure_widget_pool",
     "shell", "tasks", "traits", "net", "web"
 ]
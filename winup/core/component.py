@@ -3,6 +3,23 @@ import inspect
 from typing import Callable
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 from .platform import get_current_platform, validate_platform_compatibility
+from .reconcile import reconcile, remember
+from .pool import release_widget
+from ..tools.profiler import profiler
+
+class _Render:
+    """A render in progress: the component and the cached widgets handed out to it."""
+    __slots__ = ("component", "claimed")
+
+    def __init__(self, component: 'Component'):
+        self.component = component
+        self.claimed = set()
+
+_render_stack = []
+
+def current_render():
+    """Returns the innermost render in progress, or None."""
+    return _render_stack[-1] if _render_stack else None
 
 class Component(QWidget):
     """A base class for all WinUp components, handling lifecycle events."""
@@ -40,32 +57,69 @@ class Component(QWidget):
         """
         For functional components, this calls the user's render function.
         For class-based components, this method should be overridden to return a widget.
+
+        On a re-render, the new widget tree is reconciled into the mounted one
+        (see `winup.core.reconcile`), so unchanged widgets keep their state.
         """
+        profile = profiler.render_profile
+        if profile is None or not self.render_func:
+            return self._render()
+        profile.enter(self.render_func.__name__)
+        try:
+            return self._render()
+        finally:
+            profile.exit()
+
+    def _render(self):
         # Functional component logic
         if self.render_func:
-            # Clear previous content if any
-            if self.layout() is not None and self.layout().count() > 0:
-                while (item := self.layout().takeAt(0)) is not None:
-                    if item.widget():
-                        if isinstance(item.widget(), Component):
-                            item.widget()._unmount()
-                        item.widget().deleteLater()
-
             # Call the user's component function to get the new widget
-            self.child_component = self.render_func(**self.props)
-            if not isinstance(self.child_component, QWidget):
+            _render_stack.append(_Render(self))
+            try:
+                new_child = self.render_func(**self.props)
+            finally:
+                _render_stack.pop()
+            if not isinstance(new_child, QWidget):
                 raise TypeError(
                     f"Component '{self.render_func.__name__}' must return a QWidget, "
-                    f"but it returned type '{type(self.child_component).__name__}'."
+                    f"but it returned type '{type(new_child).__name__}'."
                 )
             
-            if hasattr(self.child_component, '_winup_on_mount'):
-                self.on_mount_handler = self.child_component._winup_on_mount
+            if hasattr(new_child, '_winup_on_mount'):
+                self.on_mount_handler = new_child._winup_on_mount
             
-            if hasattr(self.child_component, '_winup_on_unmount'):
-                self.on_unmount_handler = self.child_component._winup_on_unmount
+            if hasattr(new_child, '_winup_on_unmount'):
+                self.on_unmount_handler = new_child._winup_on_unmount
+
+            old_child = self.child_component
+            if old_child is not None and self.layout().indexOf(old_child) >= 0:
+                self.setUpdatesEnabled(False)
+                try:
+                    child = reconcile(old_child, new_child)
+                    if child is old_child:
+                        if new_child is not old_child:
+                            release_widget(new_child)
+                    else:
+                        self.layout().replaceWidget(old_child, child)
+                        if isinstance(old_child, Component):
+                            old_child._unmount()
+                        old_child.setParent(None)
+                        release_widget(old_child)
+                finally:
+                    self.setUpdatesEnabled(True)
+            else:
+                # First render: clear previous content if any
+                if self.layout() is not None and self.layout().count() > 0:
+                    while (item := self.layout().takeAt(0)) is not None:
+                        if item.widget():
+                            if isinstance(item.widget(), Component):
+                                item.widget()._unmount()
+                            release_widget(item.widget())
+                child = new_child
+                remember(child)
+                self.layout().addWidget(child)
 
-            self.layout().addWidget(self.child_component)
+            self.child_component = child
             return self.child_component
         
         # Class-based components should override this
@@ -91,6 +145,56 @@ class Component(QWidget):
         if self.on_unmount_handler:
             self.on_unmount_handler()
 
+_VARIADIC_OR_POSITIONAL_ONLY = (
+    inspect.Parameter.VAR_POSITIONAL,
+    inspect.Parameter.VAR_KEYWORD,
+    inspect.Parameter.POSITIONAL_ONLY,
+)
+
+def _make_binder(func: Callable, sig: inspect.Signature) -> Callable:
+    """
+    Returns `bind(args, kwargs) -> props` for a component function, equivalent
+    to `sig.bind(*args, **kwargs)` with defaults applied. The parameters are
+    read once here, so binding a call is a few dict operations; anything the
+    fast path does not handle (including invalid calls) goes through `sig.bind`.
+    """
+    def slow_bind(args, kwargs):
+        try:
+            bound_args = sig.bind(*args, **kwargs)
+        except TypeError as e:
+            # Provide a more helpful error message
+            raise TypeError(f"Error calling component '{func.__name__}': {e}. Check the arguments being passed.")
+        bound_args.apply_defaults()
+        return dict(bound_args.arguments)
+
+    params = list(sig.parameters.values())
+    if any(p.kind in _VARIADIC_OR_POSITIONAL_ONLY for p in params):
+        return slow_bind
+
+    positional = tuple(p.name for p in params if p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    accepted = frozenset(p.name for p in params)
+    defaults = tuple((p.name, p.default) for p in params if p.default is not inspect.Parameter.empty)
+    count = len(params)
+
+    def bind(args, kwargs):
+        if len(args) > len(positional):
+            return slow_bind(args, kwargs)
+        props = dict(zip(positional, args))
+        for name, value in kwargs.items():
+            if name not in accepted or name in props:
+                return slow_bind(args, kwargs)
+            props[name] = value
+        if len(props) < count:
+            for name, default in defaults:
+                if name not in props:
+                    props[name] = default
+            if len(props) < count:
+                # A required argument is missing; let sig.bind report it.
+                return slow_bind(args, kwargs)
+        return props
+
+    return bind
+
 def component(func=None, *, platforms=None, web=False, desktop=True):
     """
     A decorator that turns a function into a Component class factory.
@@ -130,6 +234,12 @@ def component(func=None, *, platforms=None, web=False, desktop=True):
         
         # Store platform info on the function
         func._winup_platforms = supported_platforms
+
+        # Inspect the signature once; every call reuses the binder.
+        sig = inspect.signature(func)
+        bind = _make_binder(func, sig)
+        # Platforms this component has already been validated against
+        validated_platforms = set()
         
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -137,44 +247,27 @@ def component(func=None, *, platforms=None, web=False, desktop=True):
             current_platform = get_current_platform()
             
             # Validate platform compatibility
-            validate_platform_compatibility(func, current_platform)
+            if current_platform not in validated_platforms:
+                validate_platform_compatibility(func, current_platform)
+                validated_platforms.add(current_platform)
             
+            # The user's function now doesn't need to accept args, just kwargs (props)
+            # We bind the args to the function signature to create the props dict
+            props = bind(args, kwargs)
+
             # Handle web rendering
-            if current_platform == 'web' or 'web' in supported_platforms:
+            if current_platform == 'web':
                 # For web components, return the function result directly
                 # This allows web components to return HTML/web elements
-                if current_platform == 'web':
-                    sig = inspect.signature(func)
-                    try:
-                        bound_args = sig.bind(*args, **kwargs)
-                    except TypeError as e:
-                        raise TypeError(f"Error calling component '{func.__name__}': {e}. Check the arguments being passed.")
-                    bound_args.apply_defaults()
-                    return func(**dict(bound_args.arguments))
-            
-            # Handle desktop rendering (existing logic)
-            # The user's function now doesn't need to accept args, just kwargs (props)
-            # We bind the args to the function signature to create the props dict
-            sig = inspect.signature(func)
-            try:
-                bound_args = sig.bind(*args, **kwargs)
-            except TypeError as e:
-                # Provide a more helpful error message
-                raise TypeError(f"Error calling component '{func.__name__}': {e}. Check the arguments being passed.")
-                
-            bound_args.apply_defaults()
-            props = dict(bound_args.arguments)
-
-            # The render function to be passed to the Component class
-            def render_function(**p):
-                return func(**p)
-                
-            # The lifecycle hooks are now picked up from the returned widget inside Component.render
-            return Component(render_func=render_function, props=props)
+                return func(**props)
+
+            # The lifecycle hooks are now picked up from the returned widget inside Component.render.
+            # Passing `func` itself lets a re-render recognize the same component.
+            return Component(render_func=func, props=props)
 
         # Attach the original function's signature to the wrapper.
         # This helps avoid recursion issues with `inspect.signature` on decorated functions.
-        wrapper.__signature__ = inspect.signature(func)
+        wrapper.__signature__ = sig
         wrapper._winup_platforms = supported_platforms
         return wrapper
     
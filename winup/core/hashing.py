@@ -0,0 +1,66 @@
+# winup/core/hashing.py
+"""
+Structural cache keys for memoized components.
+
+Props often contain dicts and lists, which cannot be hashed. `make_key` turns
+arguments into a hashable key that compares by value: dicts and sets ignore
+insertion order, dataclasses compare by their fields and array-like objects
+(e.g. numpy arrays) by a hash of their buffer. Other unhashable objects have
+no value to compare, so arguments containing them are not cached at all.
+"""
+import dataclasses
+import hashlib
+from typing import Any, Callable, Optional
+
+_ATOMS = (str, int, float, bool, bytes, type(None))
+
+# Tags keep structurally different containers from producing equal keys.
+_DICT, _LIST, _TUPLE, _SET, _DATACLASS, _ARRAY = range(6)
+
+
+class Uncacheable(TypeError):
+    """Raised for arguments that cannot be turned into a key that compares by value."""
+
+
+def freeze(value: Any) -> Any:
+    """Converts a value into a hashable equivalent that compares by structure."""
+    if isinstance(value, _ATOMS):
+        return value
+    if isinstance(value, dict):
+        return (_DICT, frozenset((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return (_LIST, tuple(freeze(v) for v in value))
+    if isinstance(value, tuple):
+        return (_TUPLE, tuple(freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return (_SET, frozenset(freeze(v) for v in value))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (_DATACLASS, type(value),
+                tuple(freeze(getattr(value, f.name)) for f in dataclasses.fields(value)))
+    if hasattr(value, "__array_interface__") and hasattr(value, "tobytes"):
+        digest = hashlib.blake2b(value.tobytes(), digest_size=16).digest()
+        return (_ARRAY, type(value), str(value.dtype), tuple(value.shape), digest)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        # An id() would outlive the object and match whatever is allocated
+        # at the same address next.
+        raise Uncacheable(f"'{type(value).__name__}' objects cannot be compared by value") from None
+
+
+def make_key(args: tuple, kwargs: dict, key: Optional[Callable] = None) -> Any:
+    """
+    Builds the cache key for a call. Hashable arguments are used as they are;
+    anything else is frozen with `freeze`, which raises `Uncacheable` for
+    unhashable objects it does not know. A custom `key` function receives
+    the call's arguments and returns the key itself.
+    """
+    if key is not None:
+        return key(*args, **kwargs)
+    try:
+        result = (args, frozenset(kwargs.items()))
+        hash(result)
+        return result
+    except TypeError:
+        return (freeze(args), freeze(kwargs))
@@ -1,54 +1,228 @@
 import functools
-from ..tools import profiler
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
 
-_cache = {}
+import shiboken6
+from PySide6.QtWidgets import QWidget
+from ..tools.profiler import profiler
+from .hashing import Uncacheable, make_key
+
+# Rough memory cost of one cached widget, used for the byte budget.
+WIDGET_BYTES = 4096
+
+_caches = []  # Every memoized function's cache, for clear_memo_cache()
+_lru = OrderedDict()  # (cache, key) -> estimated bytes, least recently used first
+_max_bytes: Optional[int] = None
+_total_bytes = 0
 _hits = 0
 _misses = 0
+_evictions = 0
+
+
+class _Entry:
+    __slots__ = ("value", "expires")
+
+    def __init__(self, value: Any, expires: Optional[float]):
+        self.value = value
+        self.expires = expires
+
+
+class _MemoCache:
+    """The LRU cache of one memoized function."""
+
+    def __init__(self, func, maxsize: Optional[int], ttl: Optional[float]):
+        self.func = func
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: "OrderedDict[Any, _Entry]" = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires is not None and entry.expires < time.monotonic():
+            self.evict(key)
+            return None
+        value = entry.value
+        if isinstance(value, QWidget) and not shiboken6.isValid(value):
+            self.evict(key)
+            return None
+        self.entries.move_to_end(key)
+        _lru.move_to_end((self, key))
+        return entry
+
+    def put(self, key, value):
+        global _total_bytes
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        if key in self.entries:
+            self.evict(key, count=False)
+        self.entries[key] = _Entry(value, expires)
+        size = _estimate_size(value)
+        _lru[(self, key)] = size
+        _total_bytes += size
+        if isinstance(value, QWidget):
+            # A cached widget may be handed out again, so it must not be pooled.
+            value._winup_memoized = True
+            # Drop the entry as soon as the widget is destroyed.
+            value.destroyed.connect(functools.partial(self._widget_destroyed, key, id(value)))
+
+        if self.maxsize is not None:
+            while len(self.entries) > self.maxsize:
+                self.evict(next(iter(self.entries)))
+        _enforce_byte_budget()
+
+    def evict(self, key, count: bool = True):
+        global _total_bytes, _evictions
+        if self.entries.pop(key, None) is None:
+            return
+        _total_bytes -= _lru.pop((self, key), 0)
+        if count:
+            _evictions += 1
+            profiler.record_memo_eviction()
+
+    def clear(self):
+        for key in list(self.entries):
+            self.evict(key, count=False)
+
+    def _widget_destroyed(self, key, widget_id, *_):
+        entry = self.entries.get(key)
+        if entry is not None and id(entry.value) == widget_id:
+            self.evict(key)
+
+
+def _estimate_size(value: Any) -> int:
+    if isinstance(value, QWidget):
+        return WIDGET_BYTES * (1 + len(value.findChildren(QWidget)))
+    return sys.getsizeof(value)
+
+
+def _enforce_byte_budget():
+    while _max_bytes is not None and _total_bytes > _max_bytes and _lru:
+        cache, key = next(iter(_lru))
+        cache.evict(key)
+
 
-def memo(func):
+def _can_hand_out(widget: QWidget) -> bool:
+    """
+    Whether a cached widget may be returned again. A widget can only live in
+    one layout, so it is reused only if it is unmounted, or if it belongs to
+    the component that is re-rendering right now and has not been handed out
+    yet during that render.
+    """
+    from .component import current_render
+    render = current_render()
+    if render is not None and id(widget) in render.claimed:
+        return False
+    if widget.parent() is not None and (render is None or not render.component.isAncestorOf(widget)):
+        return False
+    _claim(widget)
+    return True
+
+
+def _claim(widget: QWidget):
+    """Marks a widget as handed out during the current render."""
+    from .component import current_render
+    render = current_render()
+    if render is not None:
+        render.claimed.add(id(widget))
+
+
+def memo(func=None, *, maxsize: Optional[int] = 128, ttl: Optional[float] = None, key: Callable = None):
     """
     A memoization decorator for WinUp components.
-    
+
     Caches the component's output based on its arguments. If the component
     is called again with the same arguments, the cached widget is returned
     instead of re-creating it. This can significantly speed up rendering
     of complex or repeated components.
+
+    Each memoized function keeps at most `maxsize` results (least recently
+    used are evicted first) for at most `ttl` seconds. A cached widget is only
+    returned while it is alive and not mounted somewhere else; otherwise the
+    component is rendered again.
+
+    Arguments are compared by value, including dicts and lists in props. Pass
+    `key` to derive the cache key yourself, e.g. `key=lambda row: row["id"]`.
+
+    Usage:
+        @memo
+        def Row(...): ...
+
+        @memo(maxsize=1000, ttl=60)
+        def Cell(...): ...
     """
+    if func is None:
+        return functools.partial(memo, maxsize=maxsize, ttl=ttl, key=key)
+
+    cache = _MemoCache(func, maxsize, ttl)
+    _caches.append(cache)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         global _hits, _misses
-        # Create a cache key from the function and its arguments.
-        # We handle unhashable types like dicts and lists.
+        # Create a cache key from the arguments, comparing dicts and lists by value.
         try:
-            key = (func, args, frozenset(kwargs.items()))
-        except TypeError:
-            # Fallback for unhashable kwargs by converting them to a string.
-            # This is less robust but handles common cases like dicts in props.
-            key = (func, args, str(kwargs))
+            call_key = make_key(args, kwargs, key)
+        except Uncacheable:
+            # Arguments that can only be compared by identity bypass the cache.
+            _misses += 1
+            profiler.record_memo_miss()
+            return func(*args, **kwargs)
 
         # Check if the result is already in the cache.
-        if key in _cache:
+        entry = cache.get(call_key)
+        if entry is not None and (not isinstance(entry.value, QWidget) or _can_hand_out(entry.value)):
             _hits += 1
-            profiler.results['memo_hits'] = _hits
-            return _cache[key]
-        
+            profiler.record_memo_hit()
+            return entry.value
+
         # If not, call the function, store the result, and return it.
         _misses += 1
-        profiler.results['memo_misses'] = _misses
+        profiler.record_memo_miss()
         result = func(*args, **kwargs)
-        _cache[key] = result
+        if entry is None:
+            cache.put(call_key, result)
+        # Otherwise the cached widget is mounted elsewhere: it keeps its
+        # entry and the fresh widget is not cached.
+        if isinstance(result, QWidget):
+            _claim(result)
         return result
-        
+
+    wrapper.cache_clear = cache.clear
+    wrapper.cache_info = lambda: {
+        "size": len(cache.entries), "maxsize": cache.maxsize, "ttl": cache.ttl,
+    }
     return wrapper
 
+def configure_memo(max_bytes: Optional[int] = None):
+    """
+    Sets a memory budget shared by all memoized functions. When the estimated
+    size of all cached results exceeds `max_bytes`, the least recently used
+    entries are evicted. `None` disables the budget.
+    """
+    global _max_bytes
+    _max_bytes = max_bytes
+    _enforce_byte_budget()
+
+def memo_stats() -> dict:
+    """Returns the hit, miss and eviction counts and the current cache size."""
+    return {
+        "hits": _hits,
+        "misses": _misses,
+        "evictions": _evictions,
+        "entries": len(_lru),
+        "bytes": _total_bytes,
+    }
+
 def clear_memo_cache():
     """Clears the entire memoization cache."""
-    global _cache, _hits, _misses
-    _cache.clear()
+    global _hits, _misses, _evictions
+    for cache in _caches:
+        cache.clear()
     _hits = 0
     _misses = 0
-    if 'memo_hits' in profiler.results:
-        del profiler.results['memo_hits']
-    if 'memo_misses' in profiler.results:
-        del profiler.results['memo_misses']
-    print("Memoization cache cleared.") 
\ No newline at end of file
+    _evictions = 0
+    profiler.reset_memo_stats()
+    print("Memoization cache cleared.")
@@ -6,6 +6,8 @@ from typing import Set, Optional
 
 # Global platform context - can be set by the application
 _current_platform: Optional[str] = None
+# Result of the environment check, computed on first use
+_detected_platform: Optional[str] = None
 
 def set_platform(platform: str):
     """Set the current platform context."""
@@ -16,20 +18,23 @@ def set_platform(platform: str):
 
 def get_current_platform() -> str:
     """Get the current platform context."""
-    global _current_platform
+    global _detected_platform
     
     if _current_platform:
         return _current_platform
+    if _detected_platform:
+        return _detected_platform
     
     # Auto-detect platform based on environment
     # This is a simple heuristic - can be enhanced
     try:
         # If we can import PySide6, assume desktop
         import PySide6
-        return 'desktop'
+        _detected_platform = 'desktop'
     except ImportError:
         # If PySide6 not available, assume web
-        return 'web'
+        _detected_platform = 'web'
+    return _detected_platform
 
 def is_platform_supported(component_func, platform: str = None) -> bool:
     """Check if a component supports the given platform."""
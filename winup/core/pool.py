@@ -0,0 +1,231 @@
+# winup/core/pool.py
+"""
+Recycling of widgets that are removed from the UI.
+
+Building a widget is dominated by its styling (`styler.apply_props`), which
+depends only on its props. When pooling is enabled, widgets removed by the
+framework (router navigation, `clear_layout`, re-renders) are kept instead
+of destroyed, and `create_widget` hands them out again for the next widget of
+the same class and props. Only the content is reset, e.g. a label's text or
+a button's click handler.
+
+A widget class opts in by declaring its content arguments and how to apply
+them to a recycled instance:
+
+    class Label(QLabel):
+        _winup_content_args = ("text",)
+
+        def _winup_recycle(self, text: str = ""):
+            self.setText(text)
+
+A released widget is only recycled if its state still matches the state it
+was created with (apart from its content), so widgets changed by hand after
+creation are destroyed as before.
+"""
+import inspect
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import shiboken6
+from PySide6.QtCore import SIGNAL, Qt
+from PySide6.QtWidgets import QWidget
+
+from .hashing import freeze
+from .reconcile import _info, _layout_widgets, connect_handler
+
+# Signals Qt itself connects to (e.g. `destroyed`, for stylesheet caches);
+# their receivers say nothing about how the widget is used.
+_QWIDGET_SIGNALS = frozenset(_info(QWidget)[1])
+
+
+class WidgetPool:
+    """Released widgets, grouped by class and props."""
+
+    def __init__(self):
+        self.max_per_key = 0
+        self.hits = 0
+        self.misses = 0
+        self._free: "OrderedDict[Any, list]" = OrderedDict()
+        # The state of a freshly created widget, per key. Widgets built from
+        # the same class and props start out identical, so one is enough.
+        self._baselines: Dict[Any, tuple] = {}
+        self._parking: Optional[QWidget] = None
+        self._positional: Dict[type, tuple] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_per_key > 0
+
+    def key_for(self, widget_class: type, args: tuple, kwargs: dict, props: dict):
+        """
+        Returns `(key, content)` for a widget about to be created, or
+        `(None, None)` if it cannot come from the pool.
+        """
+        content_args = getattr(widget_class, "_winup_content_args", None)
+        if not self.enabled or content_args is None:
+            return None, None
+        names = self._positional_names(widget_class)
+        if len(args) > len(names):
+            return None, None
+        content, other = {}, {}
+        for name, value in [*zip(names, args), *kwargs.items()]:
+            if name == "parent":
+                return None, None
+            (content if name in content_args else other)[name] = value
+        # The `key` prop only identifies the widget; it does not affect styling.
+        style_props = {k: v for k, v in props.items() if k != "key"}
+        try:
+            key = (widget_class, freeze(style_props), freeze(other))
+            hash(key)
+        except TypeError:
+            return None, None
+        return key, content
+
+    def acquire(self, key, content: dict) -> Optional[QWidget]:
+        """Returns a recycled widget for `key` with `content` applied, or None."""
+        free = self._free.get(key)
+        while free:
+            widget = free.pop()
+            if shiboken6.isValid(widget):
+                widget._winup_recycle(**content)
+                self.hits += 1
+                return widget
+        self.misses += 1
+        return None
+
+    def track(self, widget: QWidget, key):
+        """Marks a newly created widget as recyclable under `key`."""
+        widget._winup_pool_key = key
+        if key not in self._baselines:
+            # The state is compared on release after the handlers are
+            # disconnected, so record it without them as well.
+            handlers = dict(getattr(widget, "_winup_handlers", {}))
+            for signal_name in handlers:
+                connect_handler(widget, signal_name, None)
+            self._baselines[key] = self._state(widget)
+            for signal_name, handler in handlers.items():
+                connect_handler(widget, signal_name, handler)
+
+    def release(self, widget: QWidget) -> bool:
+        """
+        Takes a widget that was removed from the UI. Poolable widgets in its
+        tree are kept for reuse. Returns True if `widget` itself was kept;
+        otherwise the caller deletes it.
+        """
+        if not self.enabled or not shiboken6.isValid(widget):
+            return False
+        # Recycle the children first, so a container is kept empty.
+        for child in _layout_widgets(widget):
+            widget.layout().removeWidget(child)
+            if not self.release(child):
+                child.setParent(None)
+                child.deleteLater()
+
+        # Plain dict lookups: missing attributes are slow to look up on Qt objects.
+        attrs = vars(widget)
+        key = attrs.get("_winup_pool_key")
+        if key is None or attrs.get("_winup_memoized") or attrs.get("_winup_bound"):
+            # Cached by @memo, or referenced by state bindings.
+            return False
+        free = self._free.setdefault(key, [])
+        if len(free) >= self.max_per_key:
+            return False
+        for signal_name in list(attrs.get("_winup_handlers", ())):
+            connect_handler(widget, signal_name, None)
+        if widget.layout() is not None and widget.layout().count():
+            return False
+        if self._state(widget) != self._baselines.get(key):
+            return False
+
+        # An incremental build must not keep filling the widget once it is reused.
+        build = attrs.get("_winup_build")
+        if build is not None:
+            build.cancel()
+            build.deleteLater()
+
+        # Parking the widget under a hidden holder is cheaper than making it a
+        # top-level window, and keeps it alive when its old parent is deleted.
+        widget.setParent(self._holder())
+        for attr in ("_winup_rendered", "_winup_key", "_winup_on_mount", "_winup_on_unmount", "_winup_build"):
+            attrs.pop(attr, None)
+        free.append(widget)
+        return True
+
+    def clear(self):
+        """Destroys all pooled widgets."""
+        if self._parking is not None and shiboken6.isValid(self._parking):
+            self._parking.deleteLater()
+        self._parking = None
+        self._free.clear()
+        self._baselines.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "pooled": sum(len(free) for free in self._free.values()),
+        }
+
+    def _holder(self) -> QWidget:
+        if self._parking is None or not shiboken6.isValid(self._parking):
+            self._parking = QWidget()
+        return self._parking
+
+    def _positional_names(self, widget_class: type) -> tuple:
+        names = self._positional.get(widget_class)
+        if names is None:
+            params = list(inspect.signature(widget_class.__init__).parameters.values())[1:]
+            names = self._positional[widget_class] = tuple(
+                p.name for p in params
+                if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+            )
+        return names
+
+    @staticmethod
+    def _state(widget: QWidget) -> tuple:
+        """
+        The parts of a widget's state that props set or user code commonly
+        changes, excluding its content. Fonts are left out: stylesheets
+        adjust them when the widget is polished.
+        """
+        dynamic = tuple(
+            (name, widget.property(name))
+            for name in (bytes(name).decode() for name in widget.dynamicPropertyNames())
+            if not name.startswith("_q_")
+        )
+        return (
+            widget.styleSheet(), widget.isEnabled(), widget.toolTip(), widget.objectName(),
+            widget.testAttribute(Qt.WA_WState_ExplicitShowHide) and widget.isHidden(),
+            dynamic, type(widget.layout()), _connections(widget),
+        )
+
+
+def _connections(widget: QWidget) -> int:
+    """Counts the receivers of the widget's own signals, e.g. `clicked` or `textChanged`."""
+    return sum(
+        widget.receivers(SIGNAL(signal)) for signal in _info(type(widget))[1]
+        if signal not in _QWIDGET_SIGNALS
+    )
+
+
+pool = WidgetPool()
+
+
+def release_widget(widget: QWidget):
+    """
+    Disposes of a widget that was removed from the UI: widgets in its tree are
+    recycled if pooling is enabled, everything else is deleted.
+    """
+    if not pool.release(widget):
+        widget.deleteLater()
+
+
+def configure_widget_pool(max_per_key: int = 32):
+    """
+    Enables recycling of removed widgets, keeping up to `max_per_key` idle
+    widgets for each combination of widget class and props. 0 disables the
+    pool and destroys the widgets it holds.
+    """
+    pool.max_per_key = max_per_key
+    if max_per_key <= 0:
+        pool.clear()
@@ -0,0 +1,314 @@
+# winup/core/reconcile.py
+"""
+In-place re-rendering for functional components.
+
+When a component renders again, the freshly built widget tree is compared with
+the one on screen and the existing widgets are patched instead of replaced:
+
+- Widgets of the same class are matched by `key` (set with the `key` prop),
+  otherwise by class in order of appearance.
+- Only properties whose rendered value changed since the previous render are
+  written, so state the user changed (typed text, scroll position, focus,
+  selection) survives a re-render.
+- Event handlers registered with `connect_handler` (the `on_click`,
+  `on_toggle`, ... arguments of WinUp widgets) are moved to the kept widget.
+- Widgets that cannot be matched are created or destroyed.
+
+A widget is only patched if its class defines `_winup_patch(new)`, which
+copies whatever the widget shows beyond the compared properties (e.g. the
+items of a ComboBox), and its layout is a plain box layout (Row, Column,
+Frame) or it has none. Widgets with signal connections not made through
+`connect_handler`, or bound to state, are replaced as well: their handlers
+and formatters may differ between renders in ways that cannot be compared.
+Classes that connect their own signals declare how many connections that
+makes in `_winup_own_connections`.
+"""
+from typing import Callable, Dict, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject, QSignalBlocker, Qt, SIGNAL
+from PySide6.QtWidgets import QBoxLayout, QWidget
+
+# Qt properties compared between renders. Layout-managed geometry and
+# visibility are left alone.
+_PATCHED_PROPERTIES = (
+    "objectName", "enabled", "toolTip", "styleSheet", "font",
+    "minimumSize", "maximumSize",
+    "text", "placeholderText", "title", "plainText",
+    "checkable", "checked", "readOnly",
+    "minimum", "maximum", "value", "currentIndex",
+)
+
+# {widget class: (patched property names it has, its signal signatures)}
+_class_info: Dict[type, tuple] = {}
+
+
+def set_key(widget: QWidget, key):
+    """Gives a widget a key that identifies it among its siblings across renders."""
+    widget._winup_key = key
+
+
+def connect_handler(widget: QWidget, signal_name: str, handler: Optional[Callable]):
+    """
+    Connects an event handler to a widget's signal, replacing the handler
+    previously connected this way. Handlers connected like this are carried
+    over when a re-render patches the widget in place.
+    """
+    handlers = getattr(widget, "_winup_handlers", None)
+    if handlers is None:
+        handlers = widget._winup_handlers = {}
+    signal = getattr(widget, signal_name)
+    previous = handlers.pop(signal_name, None)
+    if previous is not None:
+        try:
+            signal.disconnect(previous)
+        except (RuntimeError, TypeError):
+            pass
+    if handler is not None:
+        signal.connect(handler)
+        handlers[signal_name] = handler
+
+
+def remember(widget: QWidget):
+    """Records the rendered state of a widget tree as the baseline for the next render."""
+    widget._winup_rendered = _snapshot(widget)
+    for child in _layout_widgets(widget):
+        remember(child)
+
+
+def reconcile(old: QWidget, new: QWidget) -> QWidget:
+    """
+    Patches the widget tree `old` to match the newly rendered tree `new`.
+
+    Returns `old` if it was patched in place; `new` is then no longer needed
+    and should be deleted by the caller (widgets moved from it into `old`
+    have already been reparented). Returns `new` if `old` had to be replaced.
+    """
+    if old is new:
+        return old
+    if not _can_patch(old, new):
+        remember(new)
+        return new
+
+    render_func = getattr(new, "render_func", None)
+    if render_func is not None:
+        # A nested functional component: re-render the mounted instance with
+        # the new props. It may read state, so this happens even if the props
+        # did not change; skipping renders is left to @memo.
+        old.props = new.props
+        old.render()
+        return old
+
+    rendered = _snapshot(new)
+    _patch_properties(old, new, old._winup_rendered, rendered)
+    old._winup_rendered = rendered
+    _patch_handlers(old, new)
+    old._winup_patch(new)
+    if hasattr(new, "props"):
+        old.props = new.props
+    if old.layout() is not None:
+        _reconcile_layout(old, new)
+    return old
+
+
+def _info(cls: type) -> tuple:
+    info = _class_info.get(cls)
+    if info is None:
+        meta = cls.staticMetaObject
+        names = tuple(name for name in _PATCHED_PROPERTIES if meta.indexOfProperty(name) >= 0)
+        # One signature per signal name: the overloads Qt generates for
+        # default arguments (e.g. `clicked()` next to `clicked(bool)`) report
+        # the receivers of the original signal and would count them twice.
+        signals = {}
+        for i in range(meta.methodCount()):
+            method = meta.method(i)
+            if method.methodType() == method.MethodType.Signal:
+                signals.setdefault(bytes(method.name()).decode(), bytes(method.methodSignature()).decode())
+        info = _class_info[cls] = (names, tuple(signals.values()))
+    return info
+
+
+# Qt connects to `destroyed` itself (e.g. for stylesheet caches), so those
+# receivers say nothing about how the widget is used.
+_QOBJECT_SIGNALS = frozenset(_info(QObject)[1])
+
+
+def _snapshot(widget: QWidget) -> dict:
+    names, _ = _info(type(widget))
+    values = {name: widget.property(name) for name in names}
+    for name in widget.dynamicPropertyNames():
+        name = bytes(name).decode()
+        if not name.startswith("_q_"):
+            values[name] = widget.property(name)
+    values["hidden"] = widget.testAttribute(Qt.WA_WState_ExplicitShowHide) and widget.isHidden()
+    values["connections"] = _unmanaged_connections(widget)
+    return values
+
+
+def _unmanaged_connections(widget: QWidget) -> int:
+    """Counts signal connections that were made neither through `connect_handler` nor by the widget itself."""
+    cls = type(widget)
+    _, signals = _info(cls)
+    total = sum(widget.receivers(SIGNAL(signal)) for signal in signals if signal not in _QOBJECT_SIGNALS)
+    return total - len(getattr(widget, "_winup_handlers", ())) - getattr(cls, "_winup_own_connections", 0)
+
+
+def _can_patch(old: QWidget, new: QWidget) -> bool:
+    if type(old) is not type(new) or not shiboken6.isValid(old):
+        return False
+    if _building(old) or _building(new):
+        # Children are still being added by an incremental build.
+        return False
+    if getattr(old, "_winup_key", None) != getattr(new, "_winup_key", None):
+        return False
+    if getattr(new, "render_func", None) is not None:
+        return old.render_func is new.render_func
+    if getattr(type(old), "_winup_patch", None) is None:
+        return False
+    rendered = getattr(old, "_winup_rendered", None)
+    if rendered is None:
+        return False
+    # Handlers connected by hand and state bindings refer to the render that
+    # made them and cannot be carried over, so such widgets are rebuilt.
+    if rendered["connections"] or _unmanaged_connections(new):
+        return False
+    if vars(old).get("_winup_bound") or vars(new).get("_winup_bound"):
+        return False
+    return _patchable_layout(old.layout()) and _patchable_layout(new.layout()) \
+        and type(old.layout()) is type(new.layout())
+
+
+def _building(widget: QWidget) -> bool:
+    build = getattr(widget, "_winup_build", None)
+    return build is not None and build.active
+
+
+def _patchable_layout(layout) -> bool:
+    if layout is None:
+        return True
+    if not isinstance(layout, QBoxLayout):
+        return False
+    for i in range(layout.count()):
+        if layout.itemAt(i).layout() is not None:
+            return False
+    return True
+
+
+def _patch_properties(old: QWidget, new: QWidget, previous: dict, rendered: dict):
+    restyle = False
+    for name, value in rendered.items():
+        if name == "connections" or previous.get(name) == value:
+            continue
+        if name == "hidden":
+            old.setHidden(value)
+        elif name == "currentIndex" or name == "value":
+            # Setting these programmatically must not look like user input.
+            blocker = QSignalBlocker(old)
+            old.setProperty(name, value)
+            blocker.unblock()
+        else:
+            old.setProperty(name, value)
+            if name not in _PATCHED_PROPERTIES:
+                restyle = True
+    if restyle:
+        from winup.style.styler import styler
+        styler.repolish(old)
+
+
+def _patch_handlers(old: QWidget, new: QWidget):
+    old_handlers = getattr(old, "_winup_handlers", {})
+    new_handlers = getattr(new, "_winup_handlers", {})
+    for signal_name in set(old_handlers) | set(new_handlers):
+        if old_handlers.get(signal_name) is not new_handlers.get(signal_name):
+            connect_handler(old, signal_name, new_handlers.get(signal_name))
+
+
+def _layout_widgets(widget: QWidget) -> list:
+    layout = widget.layout()
+    if layout is None:
+        return []
+    return [w for w in (layout.itemAt(i).widget() for i in range(layout.count())) if w is not None]
+
+
+def _reconcile_layout(old: QWidget, new: QWidget):
+    from .pool import release_widget
+    old_layout, new_layout = old.layout(), new.layout()
+    if old_layout.spacing() != new_layout.spacing():
+        old_layout.setSpacing(new_layout.spacing())
+    if old_layout.contentsMargins() != new_layout.contentsMargins():
+        old_layout.setContentsMargins(new_layout.contentsMargins())
+
+    # Index the current children: by key, or by class in order of appearance.
+    keyed, unkeyed = {}, {}
+    old_children = _layout_widgets(old)
+    for child in old_children:
+        key = getattr(child, "_winup_key", None)
+        if key is not None:
+            keyed[key] = child
+        else:
+            unkeyed.setdefault(type(child), []).append(child)
+    for siblings in unkeyed.values():
+        siblings.reverse()  # pop() takes them in order
+
+    # Detach the new layout's items; each becomes (widget or spacer, stretch, alignment).
+    stretches = [new_layout.stretch(i) for i in range(new_layout.count())]
+    entries = []
+    for stretch in stretches:
+        item = new_layout.takeAt(0)
+        child = item.widget()
+        if child is None:
+            entries.append((item, stretch, item.alignment()))
+            continue
+        if hasattr(child, "_winup_rendered"):
+            # An already mounted widget handed out again (e.g. by @memo)
+            # stays as it is rather than being matched against others.
+            entries.append((child, stretch, item.alignment()))
+            continue
+        key = getattr(child, "_winup_key", None)
+        if key is not None:
+            match = keyed.pop(key, None)
+        else:
+            siblings = unkeyed.get(type(child))
+            match = siblings.pop() if siblings else None
+        target = reconcile(match, child) if match is not None else _mount(child)
+        if target is not child:
+            # Patched into `match`; the new widget is no longer needed.
+            child.setParent(None)
+            release_widget(child)
+        entries.append((target, stretch, item.alignment()))
+
+    current = [old_layout.itemAt(i) for i in range(old_layout.count())]
+    unchanged = len(current) == len(entries) and all(
+        isinstance(target, QWidget) and item.widget() is target
+        and old_layout.stretch(i) == stretch and item.alignment() == alignment
+        for i, (item, (target, stretch, alignment)) in enumerate(zip(current, entries))
+    )
+    if not unchanged:
+        while old_layout.count():
+            old_layout.takeAt(0)
+        for target, stretch, alignment in entries:
+            if isinstance(target, QWidget):
+                old_layout.addWidget(target, stretch, alignment)
+            else:
+                old_layout.addItem(target)
+                old_layout.setStretch(old_layout.count() - 1, stretch)
+
+    kept = {id(target) for target, _, _ in entries}
+    for child in old_children:
+        if id(child) not in kept:
+            _unmount(child)
+            child.setParent(None)
+            release_widget(child)
+
+
+def _mount(widget: QWidget) -> QWidget:
+    remember(widget)
+    return widget
+
+
+def _unmount(widget: QWidget):
+    """Runs the unmount hooks of functional components in a removed subtree."""
+    if getattr(widget, "render_func", None) is not None:
+        widget._unmount()
+    for child in _layout_widgets(widget):
+        _unmount(child)
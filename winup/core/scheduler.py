@@ -0,0 +1,110 @@
+# winup/core/scheduler.py
+"""
+Time-sliced construction of large widget trees.
+
+Building thousands of widgets in one call blocks the Qt event loop until the
+last one exists. `build_incrementally` instead pulls children from an
+iterable in slices: each slice runs until a time budget (a fraction of a
+frame) is spent, then returns to the event loop so input and painting are
+handled before the next slice. Content appears progressively.
+"""
+import time
+from typing import Callable, Iterable, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QWidget
+
+# Milliseconds of work per slice, leaving most of a 60 Hz frame to Qt.
+DEFAULT_BUDGET_MS = 8.0
+
+
+class IncrementalBuild(QObject):
+    """
+    A construction in progress. Items are taken from `items` and passed to
+    `add` until the iterable is exhausted, the owner widget is destroyed or
+    `cancel()` is called.
+
+    Signals:
+        progress(int): Emitted after each slice with the number of items added so far.
+        finished(): Emitted once all items have been added.
+    """
+
+    progress = Signal(int)
+    finished = Signal()
+
+    def __init__(self, owner: QWidget, items: Iterable, add: Callable, budget_ms: float = DEFAULT_BUDGET_MS):
+        super().__init__(owner)
+        self.owner = owner
+        self.budget_ms = budget_ms
+        self.count = 0
+        self._items = iter(items)
+        self._add = add
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_slice)
+
+    @property
+    def active(self) -> bool:
+        return self._items is not None
+
+    def start(self):
+        # The first slice runs right away so the owner is never shown empty.
+        self._run_slice()
+        if self.active:
+            self._timer.start()
+
+    def cancel(self):
+        """Stops adding items. Items added so far stay in place."""
+        self._timer.stop()
+        self._items = None
+
+    def finish(self):
+        """Adds all remaining items immediately."""
+        self._consume(deadline=None)
+
+    def _run_slice(self):
+        self._consume(deadline=time.perf_counter() + self.budget_ms / 1000)
+
+    def _consume(self, deadline: Optional[float]):
+        if not self.active:
+            return
+        if not shiboken6.isValid(self.owner):
+            self.cancel()
+            return
+        try:
+            for item in self._items:
+                self._add(item)
+                self.count += 1
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self.progress.emit(self.count)
+                    return
+        except BaseException:
+            # A failed build is over; the owner must not stay marked as being
+            # filled, or re-renders would never patch it.
+            self.cancel()
+            raise
+        self.cancel()
+        self.progress.emit(self.count)
+        self.finished.emit()
+
+
+def build_incrementally(owner: QWidget, items: Iterable, add: Callable,
+                        budget_ms: float = DEFAULT_BUDGET_MS) -> IncrementalBuild:
+    """
+    Adds `items` to `owner` in time-sliced batches on the Qt event loop.
+
+    Args:
+        owner: The widget being populated. The build stops if it is destroyed.
+        items: Any iterable, typically a generator that creates the child
+               widgets as it is consumed.
+        add: Called with each item, e.g. `owner.add_child`.
+        budget_ms: Milliseconds of work per slice before yielding to the event loop.
+
+    Returns:
+        The IncrementalBuild, which can be cancelled or finished early.
+    """
+    build = IncrementalBuild(owner, items, add, budget_ms)
+    owner._winup_build = build
+    build.start()
+    return build
@@ -44,6 +44,9 @@ class Window(QMainWindow):
             self.addToolBar(tool_bar)
         if status_bar:
             self.setStatusBar(status_bar)
+        # Apply deferred global styles before the first paint, not after it.
+        from ..style.styler import styler
+        styler.reapply_global_styles()
         self.show()
 
         # Register the window with the global app manager
@@ -124,7 +124,8 @@ def RouterView(router: Router) -> Component:
             view_container.layout().addWidget(new_component)
 
     # Subscribe to changes in the router's state.
-    router.state.subscribe(_update_view)
+    # The subscription is dropped when the view is destroyed.
+    router.state.subscribe(_update_view, owner=view_container)
     
     # Perform the initial render for the starting route.
     _update_view(router.state.get())
@@ -1,7 +1,8 @@
 # winup/state/__init__.py
 from .manager import StateManager
+from .observable import ObservableList, ObservableDict
 
 # Create a singleton instance to be used across the application
 state = StateManager()
 
-__all__ = ["state"] 
\ No newline at end of file
+__all__ = ["state", "ObservableList", "ObservableDict"] 
\ No newline at end of file
@@ -0,0 +1,299 @@
+# winup/state/broadcast.py
+"""
+WebSocket broadcast pipeline for web mode.
+
+Every connection gets its own send queue and sender task, so one slow browser
+never holds up the others. Queues are keyed by state key: several updates to
+the same key within the coalescing window collapse into one message, which
+also bounds a queue to the number of distinct keys. Large values are sent as
+JSON-Patch style deltas when the client is known to hold the previous version.
+"""
+import asyncio
+import copy
+import json
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+def json_diff(old: Any, new: Any, path: tuple = ()) -> list:
+    """
+    Computes patches (see `winup.state.observable`) that turn `old` into `new`.
+    Dicts are diffed by key and lists by index; anything else is replaced.
+    """
+    if type(old) is not type(new) or not isinstance(new, (dict, list)):
+        return [] if old == new else [{"op": "replace", "path": list(path), "value": new}]
+
+    patches = []
+    if isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                patches.append({"op": "remove", "path": [*path, key]})
+        for key, value in new.items():
+            if key not in old:
+                patches.append({"op": "add", "path": [*path, key], "value": value})
+            else:
+                patches.extend(json_diff(old[key], value, (*path, key)))
+        return patches
+
+    common = min(len(old), len(new))
+    for index in range(common):
+        patches.extend(json_diff(old[index], new[index], (*path, index)))
+    for index in range(common, len(new)):
+        patches.append({"op": "add", "path": [*path, index], "value": new[index]})
+    # Remove from the end so earlier indexes stay valid.
+    for index in range(len(old) - 1, common - 1, -1):
+        patches.append({"op": "remove", "path": [*path, index]})
+    return patches
+
+
+class ClientChannel:
+    """The send queue and delivery state of a single WebSocket connection."""
+    def __init__(self, websocket: Any):
+        self.websocket = websocket
+        # Keys with undelivered changes. Values are irrelevant; the message is
+        # built from the latest published state when the queue is drained.
+        self.pending: Dict[str, None] = {}
+        # The version of each key the client currently holds.
+        self.versions: Dict[str, int] = {}
+        # Set when the client fell too far behind; the next send is a plain
+        # snapshot of the pending keys without deltas.
+        self.resync = False
+        # The keys the client's page renders. None means all keys.
+        self.topics: Optional[set] = None
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class BroadcastHub:
+    """Fans state changes out to all connected web clients."""
+    def __init__(self, coalesce_window: float = 0.016, max_pending: int = 500,
+                 send_timeout: float = 10.0, delta_threshold: int = 2048, history_size: int = 64):
+        """
+        Args:
+            coalesce_window: Seconds to wait after the first queued change before
+                             sending, so that bursts are delivered as one message.
+            max_pending: A client with more undelivered keys than this is resynced
+                         with full values instead of deltas.
+            send_timeout: Seconds a single send may take before the client is
+                          considered stalled and disconnected.
+            delta_threshold: Values whose JSON is at least this many characters
+                             are sent as deltas when that is smaller.
+            history_size: Number of deltas kept per key for clients that are a
+                          few versions behind.
+        """
+        self.coalesce_window = coalesce_window
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self.delta_threshold = delta_threshold
+        self.history_size = history_size
+        self._channels: Dict[Any, ClientChannel] = {}
+        self._values: Dict[str, Any] = {}
+        self._versions: Dict[str, int] = {}
+        # {'key': deque([(version, patches or None), ...])}; None breaks the chain.
+        self._history: Dict[str, deque] = {}
+        # {'key': (version, encoded value)}, so a value is serialized once for all clients.
+        self._encoded: Dict[str, tuple] = {}
+        # {'key': copy of the last whole value}, the base the next publish diffs against.
+        self._bases: Dict[str, Any] = {}
+
+    def configure(self, **options):
+        """Updates the hub's tuning options (see `__init__`)."""
+        for name, value in options.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise ValueError(f"Unknown broadcast option '{name}'.")
+            setattr(self, name, value)
+
+    def add(self, websocket: Any) -> ClientChannel:
+        """Registers a connection and starts its sender task."""
+        channel = ClientChannel(websocket)
+        self._channels[websocket] = channel
+        channel.task = asyncio.get_running_loop().create_task(self._run(channel))
+        return channel
+
+    def remove(self, websocket: Any):
+        """Unregisters a connection and stops its sender task."""
+        channel = self._channels.pop(websocket, None)
+        if channel and channel.task and channel.task is not asyncio.current_task():
+            channel.task.cancel()
+
+    def channel(self, websocket: Any) -> Optional[ClientChannel]:
+        return self._channels.get(websocket)
+
+    def version(self, key: str) -> int:
+        """The number of changes published for a key so far."""
+        return self._versions.get(key, 0)
+
+    def subscribe(self, websocket: Any, rendered_versions: Dict[str, int]):
+        """
+        Limits a connection to the keys its page binds. `rendered_versions`
+        maps each key to the version the page was rendered with; keys that
+        changed since then are sent right away.
+        """
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return
+        channel.topics = set(rendered_versions)
+        channel.pending = {
+            key: None for key, rendered_version in rendered_versions.items()
+            if self._versions.get(key, 0) > rendered_version
+        }
+        if channel.pending:
+            channel.wakeup.set()
+
+    def watches(self, key: str) -> bool:
+        """Whether any connected client receives updates for a key."""
+        return any(c.topics is None or key in c.topics for c in self._channels.values())
+
+    def publish(self, key: str, value: Any):
+        """Queues a whole-value change of a key for all clients."""
+        previous = self._bases.pop(key, None)
+        self._record(key, value)
+        patches = None
+        if isinstance(value, (dict, list)) and self.watches(key):
+            encoded = self._encode_value(key)
+            if encoded is not None and len(encoded) >= self.delta_threshold:
+                if previous is not None:
+                    patches = json_diff(previous, value)
+                    if len(json.dumps(patches, default=str)) * 2 > len(encoded):
+                        patches = None  # The delta is not worth it.
+                # The caller may mutate the published object in place, so the
+                # next diff needs a copy. Only values sent as deltas keep one.
+                try:
+                    self._bases[key] = copy.deepcopy(value)
+                except Exception:
+                    pass
+        self._history_entry(key, patches)
+        self._enqueue(key)
+
+    def publish_patches(self, key: str, value: Any, patches: list):
+        """Queues in-place changes of an observable collection for all clients."""
+        # The patches are the delta; no copy of the value is kept.
+        self._bases.pop(key, None)
+        self._record(key, value)
+        self._history_entry(key, patches)
+        self._enqueue(key)
+
+    def request_full(self, websocket: Any, key: str):
+        """Makes the next message for this key to this client a full value."""
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return
+        channel.versions.pop(key, None)
+        if key not in self._versions:
+            return
+        channel.pending[key] = None
+        channel.wakeup.set()
+
+    def _record(self, key: str, value: Any):
+        self._values[key] = value
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def _history_entry(self, key: str, patches: Optional[list]):
+        history = self._history.get(key)
+        if history is None:
+            history = self._history[key] = deque(maxlen=self.history_size)
+        history.append((self._versions[key], patches))
+
+    def _enqueue(self, key: str):
+        for channel in self._channels.values():
+            if channel.topics is not None and key not in channel.topics:
+                continue
+            channel.pending[key] = None
+            if len(channel.pending) > self.max_pending:
+                channel.resync = True
+            channel.wakeup.set()
+
+    def _encode_value(self, key: str) -> Optional[str]:
+        """Returns the JSON of a key's latest value, serializing it at most once."""
+        version = self._versions[key]
+        cached = self._encoded.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            encoded = json.dumps(self._values[key])
+        except (TypeError, ValueError) as e:
+            print(f"Warning: state '{key}' cannot be sent to web clients: {e}")
+            encoded = None
+        self._encoded[key] = (version, encoded)
+        return encoded
+
+    def _patches_since(self, key: str, client_version: int) -> Optional[list]:
+        """Concatenates the deltas from a client's version to the latest one, if all are known."""
+        history = self._history.get(key)
+        if not history or history[0][0] > client_version + 1:
+            return None
+        patches = []
+        for version, entry in history:
+            if version <= client_version:
+                continue
+            if entry is None:
+                return None
+            patches.extend(entry)
+        return patches
+
+    def _message_for(self, channel: ClientChannel, key: str) -> Optional[str]:
+        """Builds the message that brings a client up to date on one key."""
+        version = self._versions.get(key)
+        client_version = channel.versions.get(key)
+        if version is None or client_version == version:
+            return None
+
+        key_json = json.dumps(key)
+        message = None
+        if client_version is not None and not channel.resync:
+            patches = self._patches_since(key, client_version)
+            if patches is not None:
+                try:
+                    message = f'{{"type": "state_patch", "key": {key_json}, "patches": {json.dumps(patches)}}}'
+                except (TypeError, ValueError):
+                    message = None
+        if message is None:
+            encoded = self._encode_value(key)
+            if encoded is None:
+                return None
+            message = f'{{"type": "state_update", "key": {key_json}, "value": {encoded}}}'
+
+        channel.versions[key] = version
+        return message
+
+    async def _run(self, channel: ClientChannel):
+        """Sender loop of one connection: waits for changes and delivers them in batches."""
+        try:
+            while True:
+                await channel.wakeup.wait()
+                if self.coalesce_window:
+                    await asyncio.sleep(self.coalesce_window)
+                channel.wakeup.clear()
+
+                keys, channel.pending = channel.pending, {}
+                messages = [m for m in (self._message_for(channel, key) for key in keys) if m is not None]
+                channel.resync = False
+                if not messages:
+                    continue
+
+                if len(messages) == 1:
+                    text = messages[0]
+                else:
+                    text = '{"type": "state_batch", "messages": [' + ", ".join(messages) + ']}'
+
+                try:
+                    await asyncio.wait_for(channel.websocket.send_text(text), timeout=self.send_timeout)
+                except asyncio.TimeoutError:
+                    # The client is stalled. Disconnect it; it will reload with fresh state.
+                    print("Warning: a web client stopped receiving state updates and was disconnected.")
+                    self.remove(channel.websocket)
+                    asyncio.ensure_future(self._close(channel.websocket))
+                    return
+                except Exception:
+                    # The connection is gone; the endpoint will unregister it.
+                    self.remove(channel.websocket)
+                    return
+        except asyncio.CancelledError:
+            pass
+
+    @staticmethod
+    async def _close(websocket: Any):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
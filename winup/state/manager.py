@@ -1,17 +1,28 @@
 from PySide6.QtWidgets import QWidget, QLineEdit, QCheckBox
-from typing import TypeVar, Generic, Any, Callable, cast, Dict
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+from typing import TypeVar, Generic, Any, Callable, cast, Dict, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
 import asyncio
+import itertools
+from winup.tools.profiler import profiler
+from .observable import Observable, ObservableList, ObservableDict
+from .broadcast import BroadcastHub
 
 T = TypeVar('T')
 
+# The session whose state the current request or WebSocket connection reads and
+# writes (web mode with sessions enabled). See `winup.state.session`.
+_active_scope: ContextVar[Optional['StateManager']] = ContextVar("winup_state_scope", default=None)
+
 class State(Generic[T]):
     """A wrapper for a single piece of state, providing a typed interface."""
     def __init__(self, key: str, manager: 'StateManager', initial_value: T):
         self._key = key
         self._manager = manager
         # Set the initial value in the manager
-        if key not in self._manager._state:
-            self._manager._state[key] = initial_value
+        if key not in self._manager._state and key not in self._manager._computed:
+            self._manager._state[key] = self._manager._adopt(key, initial_value)
 
     def get(self) -> T:
         """Gets the current value of the state."""
@@ -28,19 +39,28 @@ class State(Generic[T]):
         """Sets a new value for the state and broadcasts to web clients if applicable."""
         await self._manager.set(self._key, value)
 
-    def subscribe(self, callback: Callable):
-        """Subscribes a callback to changes in this state."""
-        self._manager.subscribe(self._key, callback)
+    def subscribe(self, callback: Callable, owner: QObject = None) -> Callable:
+        """Subscribes a callback to changes in this state. Returns an unsubscribe function."""
+        return self._manager.subscribe(self._key, callback, owner=owner)
 
-    def bind_to(self, widget: QWidget, property_name: str, formatter: Callable):
-        """Binds this state to a widget's property using a formatter."""
+    def bind_to(self, widget: QWidget, property_name: str, formatter: Callable) -> int:
+        """Binds this state to a widget's property using a formatter. Returns the binding id."""
         # Use a MultiStateBinding with a single state for consistency
-        MultiStateBinding(self._manager, self).bind_to(widget, property_name, formatter)
+        return MultiStateBinding(self._manager, self).bind_to(widget, property_name, formatter)
 
     def and_(self, *others: 'State') -> 'MultiStateBinding':
         """Combines this state with others to create a multi-state binding."""
         return MultiStateBinding(self._manager, self, *others)
 
+    def map(self, fn: Callable, key: str = None) -> 'State':
+        """
+        Creates a computed state derived from this one.
+        If no key is given, one is generated from this state's key.
+        """
+        if key is None:
+            key = f"{self._key}->{next(self._manager._computed_ids)}"
+        return self._manager.computed(key, [self._key], fn)
+
 class MultiStateBinding:
     """Represents a binding to multiple state objects."""
     def __init__(self, manager: 'StateManager', *states: State):
@@ -48,11 +68,47 @@ class MultiStateBinding:
         self._states = states
         self._keys = [s._key for s in states]
 
-    def bind_to(self, widget: QWidget, property_name: str, formatter: Callable):
+    def bind_to(self, widget: QWidget, property_name: str, formatter: Callable) -> int:
         """
         Binds the collected states to a widget's property using a formatter.
+        Returns the binding id.
         """
-        self._manager.bind_to(self._keys, widget, property_name, formatter)
+        return self._manager.bind_to(self._keys, widget, property_name, formatter)
+
+class Binding:
+    """
+    A single formatter binding from one or more state keys to a widget property.
+    Bindings are created once by `StateManager.bind_to` and indexed by every key
+    they depend on, so an update only touches the bindings it affects.
+    """
+    __slots__ = ("id", "keys", "widget", "property", "formatter")
+
+    def __init__(self, binding_id: int, keys: tuple, widget: QWidget, property_name: str, formatter: Callable):
+        self.id = binding_id
+        self.keys = keys
+        self.widget = widget
+        self.property = property_name
+        self.formatter = formatter
+
+_UNSET = object()
+
+def _mark_bound(widget: QObject):
+    """Flags a widget that state updates refer to, so it is never recycled (see `winup.core.pool`)."""
+    widget._winup_bound = True
+
+class Computed:
+    """
+    A derived state value. It is cached and only re-evaluated when one of its
+    dependencies has changed and the value is read or observed.
+    """
+    __slots__ = ("key", "deps", "fn", "value", "dirty")
+
+    def __init__(self, key: str, deps: tuple, fn: Callable):
+        self.key = key
+        self.deps = deps
+        self.fn = fn
+        self.value = _UNSET
+        self.dirty = True
 
 class StateManager:
     """A centralized state management system for WinUp applications."""
@@ -63,14 +119,35 @@ class StateManager:
         self._bindings = {}
         # Stores subscriptions: {'state_key': [callback1, callback2, ...]}
         self._subscriptions = {}
-        # Stores complex bindings: {'state_key': [binding_info, ...]}
-        self._complex_bindings = {}
+        # Binding graph: {'state_key': [Binding, ...]} plus an id -> Binding index
+        self._complex_bindings: Dict[str, list[Binding]] = {}
+        self._binding_index: Dict[int, Binding] = {}
+        self._binding_ids = itertools.count(1)
+        # Computed state: {'key': Computed} and {'dependency_key': ['computed_key', ...]}
+        self._computed: Dict[str, Computed] = {}
+        self._dependents: Dict[str, list[str]] = {}
+        self._computed_ids = itertools.count(1)
         # Holds created State objects to ensure singletons per key
         self._state_objects = {}
         # For web context
         self._is_web_context = False
         self._web_connections: list[Any] = []
-
+        self._broadcast_hub = BroadcastHub()
+        # Batching: keys changed since the last flush, mapped to whether
+        # the change should also be broadcast to web clients.
+        self._dirty: Dict[str, bool] = {}
+        # Pending patches for dirty keys that were only mutated in place.
+        # A dirty key without an entry here was replaced as a whole.
+        self._patches: Dict[str, list] = {}
+        # Stores patch subscriptions for observable collections
+        self._patch_subscriptions = {}
+        self._batch_depth = 0
+        self._coalesce = False
+        self._flush_scheduled = False
+        # Per-session state for web mode, see enable_sessions()
+        self._sessions = None
+        # Optional journal that persists changes, see persist()
+        self._journal = None
 
     def set_web_context(self, is_web: bool):
         """Sets the state manager to operate in a web context."""
@@ -79,21 +156,156 @@ class StateManager:
     def add_web_connection(self, websocket: Any):
         """Adds a new client WebSocket connection."""
         self._web_connections.append(websocket)
+        self._broadcast_hub.add(websocket)
 
     def remove_web_connection(self, websocket: Any):
         """Removes a client WebSocket connection."""
         self._web_connections.remove(websocket)
+        self._broadcast_hub.remove(websocket)
+
+    def enable_sessions(self, idle_timeout: float = 1800.0, max_sessions: Optional[int] = 10000, max_keys: int = None):
+        """
+        Gives every browser session its own state in web mode.
+
+        A session reads the shared application state until it writes a key;
+        the write (or an in-place change of an observable list or dict) goes
+        to a session-local copy that is only broadcast to that session's
+        clients. Changes to the shared state still reach every session that
+        has not overridden the key.
+
+        Args:
+            idle_timeout: Seconds a session without connected clients is kept.
+            max_sessions: Maximum number of sessions kept; the least recently
+                          used idle sessions are discarded first. None removes
+                          the limit.
+            max_keys: Maximum number of keys a single session may hold.
+        """
+        from .session import SessionStore
+        self._sessions = SessionStore(self, idle_timeout, max_sessions, max_keys)
+
+    @property
+    def sessions_enabled(self) -> bool:
+        return self._sessions is not None
+
+    def has_session(self, session_id: str) -> bool:
+        """Whether a browser session with this id exists."""
+        return self._sessions is not None and session_id in self._sessions
+
+    def session(self, session_id: str) -> 'StateManager':
+        """Returns the state of a browser session, creating it if needed."""
+        if self._sessions is None:
+            raise RuntimeError("Sessions are not enabled. Call state.enable_sessions() first.")
+        return self._sessions.get(session_id)
+
+    @contextmanager
+    def use_session(self, session: 'StateManager'):
+        """
+        Routes `get`, `set` and `set_sync` to a session's state inside the block.
+        The web server wraps page rendering and each WebSocket connection in this.
+        """
+        token = _active_scope.set(session)
+        try:
+            yield session
+        finally:
+            _active_scope.reset(token)
+
+    @contextmanager
+    def shared(self):
+        """
+        Reads and writes the shared application state inside the block, even
+        while handling a session's request.
+
+        Usage:
+            with state.shared():
+                state.set_sync("online_users", count)
+        """
+        token = _active_scope.set(None)
+        try:
+            yield self
+        finally:
+            _active_scope.reset(token)
+
+    def persist(self, database, keys: list = None, compact_every: int = 1000, flush_interval: float = 0.25):
+        """
+        Stores state in an SQLite database and restores it right away.
+
+        Changes are appended to a journal (only the patches for in-place changes
+        of observable lists and dicts), which is periodically compacted into a
+        snapshot. Call this before building the UI so widgets start out with
+        the restored values.
+
+        Args:
+            database: A file path or a `winup.data.SQLiteConnector`.
+            keys: The keys to persist. Defaults to every key that is set.
+            compact_every: Journal entries after which a snapshot is written.
+            flush_interval: Seconds to buffer changes before writing them.
+
+        Returns:
+            The `StateJournal`; call its `close()` to stop persisting.
+        """
+        from .persistence import StateJournal
+        if self._journal is not None:
+            self._journal.close()
+        journal = StateJournal(self, database, keys, compact_every, flush_interval)
+        journal.restore()
+        self._journal = journal
+        return journal
+
+    def configure_broadcast(self, **options):
+        """
+        Tunes the web broadcast pipeline.
+
+        Args:
+            coalesce_window: Seconds to collect changes before sending (default 0.016).
+            max_pending: Undelivered keys after which a slow client is resynced
+                         with full values instead of deltas (default 500).
+            send_timeout: Seconds a send may take before the client is
+                          disconnected as stalled (default 10).
+            delta_threshold: Minimum JSON size of a value before deltas are
+                             considered (default 2048).
+        """
+        self._broadcast_hub.configure(**options)
+        if self._sessions is not None:
+            self._sessions.configure_broadcast(**options)
+
+    def subscribe_web_connection(self, websocket: Any, rendered_versions: Dict[str, int]):
+        """
+        Limits a client to the state keys its page binds. Until this is called,
+        a connection receives updates for every key.
+        """
+        self._broadcast_hub.subscribe(websocket, rendered_versions)
+
+    def broadcast_version(self, key: str) -> int:
+        """
+        The broadcast version of a key, recorded when a page is rendered.
+        Inside `use_session` this is the version in the session's hub, which
+        is the one the page's connection is served by.
+        """
+        scope = _active_scope.get()
+        if scope is not None and scope is not self:
+            return scope.broadcast_version(key)
+        return self._broadcast_hub.version(key)
+
+    def request_full_value(self, websocket: Any, key: str):
+        """Queues the full value of a key for one client, e.g. after it lost track of it."""
+        self._broadcast_hub.request_full(websocket, key)
 
     async def broadcast(self, key: str, value: Any):
-        """Sends a state update to all connected web clients."""
+        """
+        Queues a state update for all connected web clients. Each connection
+        is served by its own sender, so a slow client never delays the others.
+        """
         if not self._is_web_context:
             return
-        message = {"type": "state_update", "key": key, "value": value}
-        # Use asyncio.gather to send all messages concurrently
-        await asyncio.gather(
-            *[conn.send_json(message) for conn in self._web_connections]
-        )
+        self._broadcast_hub.publish(key, value)
+        if self._sessions is not None:
+            self._sessions.publish_shared(key, value)
 
+    async def broadcast_patches(self, key: str, patches: list):
+        """Queues in-place changes of an observable collection for all connected web clients."""
+        if not self._is_web_context:
+            return
+        self._publish(key, patches)
 
     def create(self, key: str, initial_value=None) -> State:
         """
@@ -107,59 +319,431 @@ class StateManager:
             pass
         return self._state_objects[key]
 
+    def create_list(self, key: str, initial_value: list = None) -> State:
+        """
+        Creates or retrieves a State holding an `ObservableList`. Appending,
+        inserting, removing or updating items is delivered to bindings,
+        patch subscribers and web clients without replacing the whole list.
+        """
+        return self.create(key, ObservableList(initial_value or []))
+
+    def create_dict(self, key: str, initial_value: dict = None) -> State:
+        """Creates or retrieves a State holding an `ObservableDict`."""
+        return self.create(key, ObservableDict(initial_value or {}))
+
+    def _adopt(self, key: str, value):
+        """
+        Prepares a value for storage under a key. Observable collections are
+        attached to the key; plain lists and dicts stored in place of an
+        observable collection are wrapped so they keep reporting patches.
+        """
+        current = self._state.get(key)
+        if isinstance(current, Observable) and current is not value:
+            current._attach(None, None)
+            if type(value) is list and isinstance(current, ObservableList):
+                value = ObservableList(value)
+            elif type(value) is dict and isinstance(current, ObservableDict):
+                value = ObservableDict(value)
+        if isinstance(value, Observable):
+            value._attach(self, key)
+        return value
+
     def set_sync(self, key: str, value):
         """
         Synchronously sets a value and updates desktop components.
         """
-        if self._state.get(key) == value:
+        scope = _active_scope.get()
+        if scope is not None and scope is not self:
+            return scope.set_sync(key, value)
+        if key in self._computed:
+            raise ValueError(f"State '{key}' is computed and cannot be set directly.")
+        if self._read(key) == value:
             return  # No change, no update needed
 
-        self._state[key] = value
+        self._state[key] = self._adopt(key, value)
+
+        if self._is_deferred():
+            self._patches.pop(key, None)
+            self._mark_dirty(key, broadcast=False)
+            return
 
         # --- Synchronous updates for Desktop ---
-        self._update_bindings(key)
-        self._update_complex_bindings(key)
-        self._execute_subscriptions(key)
+        self._apply_change(key)
 
     async def set(self, key: str, value, sync_only=False):
         """
         Sets a value in the state and updates all bound widgets and subscriptions.
         If in web context, it also broadcasts the change to clients.
         """
-        if self._state.get(key) == value:
+        scope = _active_scope.get()
+        if scope is not None and scope is not self:
+            return await scope.set(key, value, sync_only)
+        if key in self._computed:
+            raise ValueError(f"State '{key}' is computed and cannot be set directly.")
+        if self._read(key) == value:
             return # No change, no update needed
 
-        self._state[key] = value
+        self._state[key] = self._adopt(key, value)
+
+        if self._is_deferred():
+            # The broadcast happens when the pending changes are flushed.
+            self._patches.pop(key, None)
+            self._mark_dirty(key, broadcast=not sync_only)
+            return
 
         # --- Synchronous updates for Desktop ---
-        self._update_bindings(key)
-        self._update_complex_bindings(key)
-        self._execute_subscriptions(key)
+        changed_keys = self._apply_change(key)
 
         # --- Asynchronous broadcast for Web ---
         if self._is_web_context and not sync_only:
-            await self.broadcast(key, value)
-            
+            for changed_key in changed_keys:
+                await self.broadcast(changed_key, self._read(changed_key))
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups several state changes into a single update pass.
+
+        Inside the block, changed keys are only recorded. When the outermost
+        batch exits, every affected binding is applied exactly once with the
+        final values, and subscriptions run once per changed key.
+
+        Usage:
+            with state.batch():
+                state.set_sync("first", "Jane")
+                state.set_sync("last", "Doe")
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def set_coalescing(self, enabled: bool):
+        """
+        Enables or disables automatic coalescing of state updates.
+
+        When enabled, changes are queued and flushed once per event-loop tick
+        (the Qt event loop on desktop, the asyncio loop in web mode), so a
+        handler that updates many keys only repaints each bound widget once.
+        """
+        self._coalesce = enabled
+        if not enabled:
+            self.flush()
+
+    def flush(self):
+        """Applies all pending changes to bindings, subscriptions and web clients."""
+        self._flush_scheduled = False
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, {}
+        patches, self._patches = self._patches, {}
+
+        # Mark all derived state stale first, so a computed value depending on
+        # several changed keys is re-evaluated only once.
+        stale = {}
+        pending = list(dirty)
+        for key in pending:
+            for computed_key in self._dependents.get(key, ()):
+                if computed_key not in stale:
+                    computed = self._computed[computed_key]
+                    stale[computed_key] = computed.value
+                    computed.dirty = True
+                    pending.append(computed_key)
+
+        broadcast = any(dirty.values())
+        for computed_key, previous in stale.items():
+            if self._is_observed(computed_key) and self._evaluate(self._computed[computed_key]) != previous:
+                dirty.setdefault(computed_key, broadcast)
+
+        if self._journal is not None:
+            for key in dirty:
+                if key not in self._computed:
+                    self._journal.record(key, patches.get(key))
+
+        for key in dirty:
+            self._update_bindings(key)
+
+        # A binding that depends on several changed keys is applied only once.
+        applied = set()
+        for key in dirty:
+            for binding in self._complex_bindings.get(key, ()):
+                if binding.id not in applied:
+                    applied.add(binding.id)
+                    self._apply_complex_binding(binding)
+
+        for key in dirty:
+            self._execute_subscriptions(key)
+            self._execute_patch_subscriptions(key, patches.get(key))
+
+        if self._is_web_context:
+            for key, broadcast in dirty.items():
+                if broadcast:
+                    self._publish(key, patches.get(key))
+
+    def _publish(self, key: str, patches: list = None):
+        """Queues a change for web clients: patches, or the current value if replaced as a whole."""
+        value = self._read(key)
+        if patches is None:
+            self._broadcast_hub.publish(key, value)
+        else:
+            self._broadcast_hub.publish_patches(key, value, patches)
+        if self._sessions is not None:
+            self._sessions.publish_shared(key, value, patches)
+
+    def _apply_patches(self, key: str, patches: list):
+        """Called by observable collections after they were changed in place."""
+        if self._is_deferred():
+            # A pending whole-value update already covers these patches.
+            if key not in self._dirty or key in self._patches:
+                self._patches.setdefault(key, []).extend(patches)
+            self._mark_dirty(key, broadcast=True)
+            return
+
+        changed_keys = self._apply_change(key, patches)
+        if self._is_web_context:
+            for changed_key in changed_keys:
+                self._publish(changed_key, patches if changed_key == key else None)
+
+    def _apply_change(self, key: str, patches: list = None) -> list[str]:
+        """
+        Updates everything that depends on a changed key, including computed
+        state derived from it. Returns all keys whose value changed.
+        """
+        # Computed keys are derived on load, so they are never journaled.
+        if self._journal is not None and key not in self._computed:
+            self._journal.record(key, patches)
+        changed_keys = [key]
+        for changed_key in changed_keys:
+            self._update_bindings(changed_key)
+            self._update_complex_bindings(changed_key)
+            self._execute_subscriptions(changed_key)
+            self._execute_patch_subscriptions(changed_key, patches if changed_key == key else None)
+            changed_keys.extend(self._invalidate(changed_key))
+        return changed_keys
+
+    def _is_deferred(self) -> bool:
+        """Whether updates are currently being queued instead of applied."""
+        return self._batch_depth > 0 or self._coalesce
+
+    def _mark_dirty(self, key: str, broadcast: bool):
+        """Queues a key for the next flush."""
+        self._dirty[key] = self._dirty.get(key, False) or broadcast
+        if self._batch_depth == 0:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Schedules a flush on the next tick of the active event loop."""
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+
+        if self._is_web_context:
+            try:
+                asyncio.get_running_loop().call_soon(self.flush)
+                return
+            except RuntimeError:
+                pass
+        elif QCoreApplication.instance() is not None:
+            QTimer.singleShot(0, self.flush)
+            return
+
+        # No event loop to defer to, so apply the changes right away.
+        self.flush()
 
 
     def get(self, key: str, default=None):
         """Gets a value from the state."""
+        scope = _active_scope.get()
+        if scope is not None and scope is not self:
+            return scope.get(key, default)
+        return self._read(key, default)
+
+    def _read(self, key: str, default=None):
+        """Reads a value from this manager, ignoring the active session."""
+        computed = self._computed.get(key)
+        if computed is not None:
+            return self._evaluate(computed)
         return self._state.get(key, default)
 
-    def subscribe(self, key: str, callback: Callable):
+    def computed(self, key: str, deps: list, fn: Callable) -> State:
+        """
+        Creates a computed state whose value is derived from other state keys.
+
+        The value is cached and `fn` is only called again when one of the
+        dependencies has changed and the value is read, bound or subscribed to.
+        Computed keys can be used anywhere a normal key can, but cannot be set.
+
+        Args:
+            key: The key of the computed state.
+            deps: The state keys (or State objects) it depends on.
+            fn: A function that takes the dependency values (in order) and
+                returns the derived value.
+
+        Usage:
+            visible_rows = state.computed("visible_rows", ["rows", "filter"],
+                                          lambda rows, f: [r for r in rows if f in r])
+        """
+        if key in self._state:
+            raise ValueError(f"State '{key}' already exists and cannot be made computed.")
+
+        dep_keys = tuple(d._key if isinstance(d, State) else d for d in deps)
+
+        # Re-defining a computed key (e.g. on hot reload) replaces its definition.
+        previous = self._computed.get(key)
+        if previous is not None:
+            for dep in dict.fromkeys(previous.deps):
+                self._dependents[dep].remove(key)
+
+        self._computed[key] = Computed(key, dep_keys, fn)
+        for dep in dict.fromkeys(dep_keys):
+            self._dependents.setdefault(dep, []).append(key)
+
+        if key not in self._state_objects:
+            self._state_objects[key] = State(key, self, None)
+        elif previous is not None and self._is_observed(key):
+            self._apply_change(key)
+        return self._state_objects[key]
+
+    def _evaluate(self, computed: Computed):
+        """Returns a computed value, re-evaluating it if a dependency changed."""
+        if computed.dirty:
+            computed.value = computed.fn(*[self._read(dep) for dep in computed.deps])
+            computed.dirty = False
+        return computed.value
+
+    def _is_observed(self, key: str) -> bool:
+        """Whether anything is bound or subscribed to a key."""
+        return (
+            key in self._bindings
+            or key in self._complex_bindings
+            or key in self._subscriptions
+            or key in self._patch_subscriptions
+            or (self._is_web_context and self._broadcast_hub.watches(key))
+            or (self._sessions is not None and self._sessions.watches(key))
+        )
+
+    def _invalidate(self, key: str) -> list[str]:
+        """
+        Marks computed state depending on a changed key as stale. Observed
+        computed values are re-evaluated right away; unobserved ones are left
+        stale until read. Returns the computed keys whose value changed.
+        """
+        changed_keys = []
+        for computed_key in self._dependents.get(key, ()):
+            computed = self._computed[computed_key]
+            if self._is_observed(computed_key):
+                previous = computed.value
+                computed.dirty = True
+                if self._evaluate(computed) != previous:
+                    changed_keys.append(computed_key)
+            elif not computed.dirty:
+                # Nothing reads it directly, but computed state derived from it might.
+                computed.dirty = True
+                changed_keys.extend(self._invalidate(computed_key))
+        return changed_keys
+
+    def subscribe(self, key: str, callback: Callable, owner: QObject = None) -> Callable:
         """
         Subscribes a callback function to a state key. The callback will be
         executed whenever the state value changes.
 
         The callback will be immediately called with the current value upon subscription.
+
+        Args:
+            key: The state key to subscribe to.
+            callback: A function that receives the new value.
+            owner: An optional QObject that owns the subscription. It is removed
+                   automatically when the owner is destroyed. Bound methods of
+                   QObjects are owned by their object by default.
+
+        Returns:
+            A function that removes the subscription.
         """
         if key not in self._subscriptions:
             self._subscriptions[key] = []
         self._subscriptions[key].append(callback)
+
+        def unsubscribe(*_):
+            self.unsubscribe(key, callback)
+
+        if owner is None and isinstance(getattr(callback, "__self__", None), QObject):
+            owner = callback.__self__
+        if owner is not None:
+            owner.destroyed.connect(unsubscribe)
+            _mark_bound(owner)
+
         # Immediately call with current value
-        callback(self.get(key))
+        callback(self._read(key))
+        return unsubscribe
+
+    def unsubscribe(self, key: str, callback: Callable):
+        """Removes a callback previously registered with `subscribe()`."""
+        self._remove_callback(self._subscriptions, key, callback)
+
+    def subscribe_patches(self, key: str, callback: Callable, owner: QObject = None) -> Callable:
+        """
+        Subscribes to the in-place changes of an observable collection.
+
+        The callback receives a list of patches (see `winup.state.observable`)
+        for every change. It is called immediately, and whenever the value is
+        replaced as a whole, with a single patch that has an empty path.
+
+        Returns:
+            A function that removes the subscription.
+        """
+        self._patch_subscriptions.setdefault(key, []).append(callback)
+
+        def unsubscribe(*_):
+            self._remove_callback(self._patch_subscriptions, key, callback)
+
+        if owner is None and isinstance(getattr(callback, "__self__", None), QObject):
+            owner = callback.__self__
+        if owner is not None:
+            owner.destroyed.connect(unsubscribe)
+            _mark_bound(owner)
+
+        callback(self._replace_patch(key))
+        return unsubscribe
 
-    def bind_to(self, state_keys: list[str], widget: QWidget, property_name: str, formatter: Callable):
+    def _remove_callback(self, registry: dict, key: str, callback: Callable):
+        """Removes a callback from a subscription registry."""
+        callbacks = registry.get(key)
+        if not callbacks or callback not in callbacks:
+            return
+        # Replace the list rather than mutating it, so a subscription removed
+        # while callbacks are running does not disturb the iteration.
+        remaining = list(callbacks)
+        remaining.remove(callback)
+        if remaining:
+            registry[key] = remaining
+        else:
+            del registry[key]
+
+    def binding_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Reports the number of live bindings and subscriptions per state key.
+        Useful for tracking down leaks, e.g. views that are rebuilt without
+        their old widgets being released.
+        """
+        stats = {}
+        for kind, registry in (
+            ("bindings", self._bindings),
+            ("complex_bindings", self._complex_bindings),
+            ("subscriptions", self._subscriptions),
+            ("patch_subscriptions", self._patch_subscriptions),
+        ):
+            for key, entries in registry.items():
+                counts = stats.setdefault(key, {
+                    "bindings": 0, "complex_bindings": 0, "subscriptions": 0, "patch_subscriptions": 0,
+                })
+                counts[kind] = len(entries)
+        return stats
+
+    def bind_to(self, state_keys: list[str], widget: QWidget, property_name: str, formatter: Callable) -> int:
         """
         Binds one or more state keys to a widget's property using a formatter function.
 
@@ -169,22 +753,42 @@ class StateManager:
             property_name: The name of the property to update (e.g., 'text').
             formatter: A function that takes the state values as arguments (in order)
                        and returns the formatted value for the property.
+
+        Returns:
+            A stable id for the binding, which can be passed to `unbind()`.
         """
-        binding_info = {
-            "keys": state_keys,
-            "widget": widget,
-            "property": property_name,
-            "formatter": formatter,
-        }
+        binding = Binding(next(self._binding_ids), tuple(state_keys), widget, property_name, formatter)
+        self._binding_index[binding.id] = binding
 
-        # Register this binding for each key it depends on
-        for key in state_keys:
-            if key not in self._complex_bindings:
-                self._complex_bindings[key] = []
-            self._complex_bindings[key].append(binding_info)
+        # Register this binding once for each distinct key it depends on
+        for key in dict.fromkeys(binding.keys):
+            self._complex_bindings.setdefault(key, []).append(binding)
+
+        # Drop the binding as soon as the widget's C++ object is destroyed.
+        if isinstance(widget, QObject):
+            binding_id = binding.id
+            widget.destroyed.connect(lambda *_: self.unbind(binding_id))
+            _mark_bound(widget)
 
         # Immediately apply the binding
-        self._apply_complex_binding(binding_info)
+        self._apply_complex_binding(binding)
+        return binding.id
+
+    def unbind(self, binding_id: int):
+        """Removes a binding created by `bind_to()`."""
+        binding = self._binding_index.pop(binding_id, None)
+        if binding is None:
+            return
+        for key in dict.fromkeys(binding.keys):
+            bindings = self._complex_bindings.get(key)
+            if bindings is None:
+                continue
+            # Replace the list so an update currently iterating it is unaffected.
+            remaining = [b for b in bindings if b is not binding]
+            if remaining:
+                self._complex_bindings[key] = remaining
+            else:
+                del self._complex_bindings[key]
 
     def bind_two_way(self, widget: QWidget, state_key: str):
         """
@@ -221,42 +825,78 @@ class StateManager:
             state_key: The key in the state store to bind to.
         """
         # Set the initial value on the widget
-        initial_value = self.get(state_key)
+        initial_value = self._read(state_key)
         if initial_value is not None:
             self._set_widget_property(widget, property_name, initial_value)
         
         # Register the binding for future updates
         if state_key not in self._bindings:
             self._bindings[state_key] = []
-        self._bindings[state_key].append((widget, property_name))
+        entry = (widget, property_name)
+        self._bindings[state_key].append(entry)
+
+        # Drop the binding as soon as the widget's C++ object is destroyed.
+        if isinstance(widget, QObject):
+            widget.destroyed.connect(lambda *_: self._remove_binding(state_key, entry))
+            _mark_bound(widget)
+
+    def _remove_binding(self, state_key: str, entry: tuple):
+        """Removes a simple widget binding registered with `bind()`."""
+        bindings = self._bindings.get(state_key)
+        if bindings is None:
+            return
+        remaining = [b for b in bindings if b is not entry]
+        if remaining:
+            self._bindings[state_key] = remaining
+        else:
+            del self._bindings[state_key]
 
     def _update_bindings(self, key: str):
         """Update all widgets bound to a specific state key."""
         if key not in self._bindings:
             return
 
-        new_value = self.get(key)
-        for widget, property_name in self._bindings[key]:
-            self._set_widget_property(widget, property_name, new_value)
-            
-            # Repolish to apply any style changes if needed
-            widget.style().unpolish(widget)
-            widget.style().polish(widget)
+        new_value = self._read(key)
+        for entry in self._bindings[key]:
+            if not self._set_widget_property(entry[0], entry[1], new_value):
+                # The widget is gone; prune it in case `destroyed` was missed.
+                self._remove_binding(key, entry)
 
     def _execute_subscriptions(self, key: str):
         """Execute all callbacks subscribed to a specific state key."""
         if key in self._subscriptions:
-            new_value = self.get(key)
+            new_value = self._read(key)
             for callback in self._subscriptions[key]:
                 callback(new_value)
 
-    def _set_widget_property(self, widget, property_name, value):
-        """Helper to set a property on a widget, trying setter method first."""
+    def _execute_patch_subscriptions(self, key: str, patches: list = None):
+        """Execute all patch callbacks for a key. `None` means the value was replaced."""
+        if key in self._patch_subscriptions:
+            if patches is None:
+                patches = self._replace_patch(key)
+            for callback in self._patch_subscriptions[key]:
+                callback(patches)
+
+    def _replace_patch(self, key: str) -> list:
+        """A patch list that replaces the whole value of a key."""
+        value = self._read(key)
+        if isinstance(value, Observable):
+            value = value._plain()  # A snapshot, so later in-place changes don't leak in.
+        return [{"op": "replace", "path": [], "value": value}]
+
+    def _set_widget_property(self, widget, property_name, value) -> bool:
+        """
+        Helper to set a property on a widget, trying setter method first.
+        Returns False if the widget has already been deleted.
+        """
         # Special handling for the 'style' property
         if property_name == 'style' and isinstance(value, dict):
             from winup.style.styler import styler
-            styler.apply_props(widget, value)
-            return
+            try:
+                styler.apply_props(widget, value)
+            except RuntimeError:
+                return False
+            return True
 
         setter = getattr(widget, f"set{property_name.capitalize()}", None)
         try:
@@ -266,56 +906,35 @@ class StateManager:
                 widget.setProperty(property_name, value)
         except RuntimeError:
             # This can happen if the widget is deleted while a state change is in flight.
-            # It's safe to ignore, as the widget is gone anyway.
-            return
+            return False
         
-        # Repolish the widget to apply any potential style changes
+        # Repolish only if a QSS selector depends on this property; a text
+        # change, for instance, never changes which rules match the widget.
+        from winup.style.styler import styler
+        if not styler.affects_style(property_name):
+            profiler.record_repolish_skipped()
+            return True
         try:
             if widget and widget.style():
-                widget.style().unpolish(widget)
-                widget.style().polish(widget)
+                styler.repolish(widget)
         except RuntimeError:
-            pass # Widget was deleted, do nothing.
+            return False
+        return True
 
     def _update_complex_bindings(self, updated_key: str):
         """Update all complex bindings that depend on the updated key."""
-        if updated_key not in self._complex_bindings:
-            return
+        # Each binding is registered once per distinct key, so no de-duplication is needed.
+        for binding in self._complex_bindings.get(updated_key, ()):
+            self._apply_complex_binding(binding)
 
-        # Use a set to avoid updating the same binding multiple times if it depends on several updated keys
-        bindings_to_update = set()
-        for binding_info in self._complex_bindings[updated_key]:
-            # Create a tuple of the binding's components to make it hashable for the set
-            bindings_to_update.add(
-                (
-                    tuple(binding_info["keys"]),
-                    binding_info["widget"],
-                    binding_info["property"],
-                    binding_info["formatter"],
-                )
-            )
-
-        for keys, widget, prop, formatter in bindings_to_update:
-            binding_info = {
-                "keys": list(keys),
-                "widget": widget,
-                "property": prop,
-                "formatter": formatter,
-            }
-            self._apply_complex_binding(binding_info)
-
-    def _apply_complex_binding(self, binding_info: dict):
+    def _apply_complex_binding(self, binding: Binding):
         """Gathers current state values and applies a complex binding's formatter."""
-        # Gather the current values for all keys the binding depends on
-        values = [self.get(k) for k in binding_info["keys"]]
-
-        # Call the formatter with the values
+        get = self.get
         try:
-            formatted_value = binding_info["formatter"](*values)
+            formatted_value = binding.formatter(*[get(k) for k in binding.keys])
             # Update the widget property
-            self._set_widget_property(
-                binding_info["widget"], binding_info["property"], formatted_value
-            )
+            if not self._set_widget_property(binding.widget, binding.property, formatted_value):
+                # The widget is gone; prune it in case `destroyed` was missed.
+                self.unbind(binding.id)
         except Exception as e:
             print(f"Error applying binding: {e}")
-
@@ -0,0 +1,177 @@
+# winup/state/observable.py
+"""
+Observable collection types for WinUp state.
+
+An `ObservableList` or `ObservableDict` stored in the `StateManager` reports
+every structural change as a small patch instead of requiring the whole value
+to be replaced. Patches are plain dicts modelled on JSON Patch:
+
+    {"op": "add",     "path": [3],      "value": row}
+    {"op": "remove",  "path": [3]}
+    {"op": "replace", "path": ["name"], "value": "Ada"}
+
+A patch with an empty path replaces the whole value.
+"""
+from typing import Any, Iterable
+
+
+class Observable:
+    """Mixin that connects a collection to the state key it is stored under."""
+    _manager = None
+    _key = None
+
+    def _attach(self, manager, key: str):
+        """Called by the StateManager when the collection is stored under a key."""
+        self._manager = manager
+        self._key = key
+
+    def _emit(self, patches: list):
+        if self._manager is not None:
+            self._manager._apply_patches(self._key, patches)
+
+    def _emit_replace(self):
+        self._emit([{"op": "replace", "path": [], "value": self._plain()}])
+
+    def _plain(self):
+        raise NotImplementedError
+
+    def __copy__(self):
+        # Copies are detached from the state key.
+        return type(self)(self)
+
+    def __deepcopy__(self, memo):
+        import copy
+        return type(self)(copy.deepcopy(self._plain(), memo))
+
+    def __reduce__(self):
+        return (type(self), (self._plain(),))
+
+
+class ObservableList(Observable, list):
+    """A list that reports inserts, removals and updates as patches."""
+
+    def _plain(self) -> list:
+        return list(self)
+
+    def _index(self, index: int) -> int:
+        """Normalizes a negative index the way list does."""
+        return index + len(self) if index < 0 else index
+
+    def append(self, value: Any):
+        index = len(self)
+        list.append(self, value)
+        self._emit([{"op": "add", "path": [index], "value": value}])
+
+    def extend(self, values: Iterable):
+        values = list(values)
+        if not values:
+            return
+        start = len(self)
+        list.extend(self, values)
+        self._emit([{"op": "add", "path": [start + i], "value": v} for i, v in enumerate(values)])
+
+    def __iadd__(self, values: Iterable):
+        self.extend(values)
+        return self
+
+    def __imul__(self, count: int):
+        if count <= 0:
+            self.clear()
+        elif count > 1:
+            self.extend(list(self) * (count - 1))
+        return self
+
+    def insert(self, index: int, value: Any):
+        index = min(max(self._index(index), 0), len(self))
+        list.insert(self, index, value)
+        self._emit([{"op": "add", "path": [index], "value": value}])
+
+    def pop(self, index: int = -1):
+        index = self._index(index)
+        value = list.pop(self, index)
+        self._emit([{"op": "remove", "path": [index]}])
+        return value
+
+    def remove(self, value: Any):
+        index = self.index(value)
+        list.__delitem__(self, index)
+        self._emit([{"op": "remove", "path": [index]}])
+
+    def clear(self):
+        if self:
+            list.clear(self)
+            self._emit_replace()
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        if isinstance(index, slice):
+            self._emit_replace()
+        else:
+            self._emit([{"op": "replace", "path": [self._index(index)], "value": value}])
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            list.__delitem__(self, index)
+            self._emit_replace()
+        else:
+            index = self._index(index)
+            list.__delitem__(self, index)
+            self._emit([{"op": "remove", "path": [index]}])
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._emit_replace()
+
+    def reverse(self):
+        list.reverse(self)
+        self._emit_replace()
+
+
+class ObservableDict(Observable, dict):
+    """A dict that reports added, replaced and removed keys as patches."""
+
+    def _plain(self) -> dict:
+        return dict(self)
+
+    def __setitem__(self, key, value):
+        op = "replace" if key in self else "add"
+        dict.__setitem__(self, key, value)
+        self._emit([{"op": op, "path": [key], "value": value}])
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._emit([{"op": "remove", "path": [key]}])
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = dict.pop(self, key)
+        self._emit([{"op": "remove", "path": [key]}])
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._emit([{"op": "remove", "path": [key]}])
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        patches = []
+        for key, value in dict(*args, **kwargs).items():
+            patches.append({"op": "replace" if key in self else "add", "path": [key], "value": value})
+            dict.__setitem__(self, key, value)
+        if patches:
+            self._emit(patches)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        if self:
+            dict.clear(self)
+            self._emit_replace()
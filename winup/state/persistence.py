@@ -0,0 +1,240 @@
+# winup/state/persistence.py
+"""
+Persistent state: an append-only journal with compacted snapshots.
+
+Every change of a persisted key appends one row to a journal table: the new
+value for whole-value updates, or just the patches for in-place changes of an
+observable list or dict (after the first row of a key, which always holds
+its whole value). Every `compact_every` rows, the keys changed since
+the last snapshot are written to a snapshot table and the journal is cleared.
+On startup the snapshot is loaded and the journal replayed on top of it.
+
+Rows are buffered and written in one transaction shortly after a change, so a
+burst of updates costs a single commit.
+"""
+import asyncio
+import atexit
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from .observable import Observable, ObservableList, ObservableDict
+
+_KINDS = {"list": ObservableList, "dict": ObservableDict}
+
+
+def apply_patches(value: Any, patches: list) -> Any:
+    """Applies patches (see `winup.state.observable`) to a plain value and returns the result."""
+    for patch in patches:
+        path = patch["path"]
+        if not path:
+            value = patch["value"]
+            continue
+        target = value
+        for part in path[:-1]:
+            target = target[part]
+        last = path[-1]
+        if patch["op"] == "remove":
+            del target[last]
+        elif patch["op"] == "add" and isinstance(target, list):
+            target.insert(last, patch["value"])
+        else:
+            target[last] = patch["value"]
+    return value
+
+
+class StateJournal:
+    """Persists the keys of a `StateManager` to SQLite."""
+
+    def __init__(self, manager, database, keys: Optional[Iterable[str]] = None,
+                 compact_every: int = 1000, flush_interval: float = 0.25):
+        """
+        Args:
+            manager: The StateManager whose changes are recorded.
+            database: A file path or a `winup.data.SQLiteConnector`.
+            keys: The keys to persist. Defaults to every key that is set.
+            compact_every: Journal rows after which changed keys are snapshotted
+                           and the journal is cleared.
+            flush_interval: Seconds to buffer changes before writing them.
+        """
+        self.manager = manager
+        if isinstance(database, str):
+            self._connector = None
+            self.conn = sqlite3.connect(database)
+        else:
+            self._connector = database
+            database.connect()
+            self.conn = database.conn
+        self.keys = set(keys) if keys is not None else None
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self._pending: list[Tuple[str, str, str, str]] = []
+        # Keys changed since the last snapshot.
+        self._changed: set = set()
+        self._journal_rows = 0
+        self._commit_scheduled = False
+        self._unserializable: set = set()
+        # Keys with a whole value in the database that patches can be applied to.
+        self._stored: set = set()
+
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS state_snapshot (key TEXT PRIMARY KEY, kind TEXT, value TEXT)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS state_journal "
+                "(seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT, kind TEXT, op TEXT, value TEXT)"
+            )
+        self._compact_stored()
+        self._stored.update(row[0] for row in self.conn.execute("SELECT key FROM state_snapshot"))
+        atexit.register(self.close)
+
+    def load(self) -> Dict[str, Tuple[str, Any]]:
+        """Reads the stored state as {'key': (kind, value)}, replaying the journal over the snapshot."""
+        values = {}
+        for key, kind, value in self.conn.execute("SELECT key, kind, value FROM state_snapshot"):
+            values[key] = (kind, json.loads(value))
+        rows = self.conn.execute("SELECT key, kind, op, value FROM state_journal ORDER BY seq").fetchall()
+        for key, kind, op, value in rows:
+            if op == "set":
+                values[key] = (kind, json.loads(value))
+                continue
+            if key not in values:
+                # Written without a whole value to apply to. Collections
+                # created empty can still be rebuilt from their patches.
+                if kind not in _KINDS:
+                    print(f"Warning: stored changes of state '{key}' have no base value and were skipped.")
+                    continue
+                print(f"Warning: stored changes of state '{key}' have no base value; replaying them onto an empty {kind}.")
+                values[key] = (kind, [] if kind == "list" else {})
+            try:
+                values[key] = (kind, apply_patches(values[key][1], json.loads(value)))
+            except (LookupError, TypeError) as e:
+                print(f"Warning: stored changes of state '{key}' could not be replayed: {e}")
+        return values
+
+    def _compact_stored(self):
+        """Folds a journal left over from a previous run into the snapshot."""
+        keys = [row[0] for row in self.conn.execute("SELECT DISTINCT key FROM state_journal")]
+        if not keys:
+            return
+        values = self.load()
+        rows = [(key, values[key][0], json.dumps(values[key][1])) for key in keys if key in values]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO state_snapshot (key, kind, value) VALUES (?, ?, ?)", rows
+            )
+            self.conn.execute("DELETE FROM state_journal")
+
+    def restore(self):
+        """Loads the stored state into the manager. Bound widgets of existing keys are updated."""
+        manager = self.manager
+        for key, (kind, value) in self.load().items():
+            if self.keys is not None and key not in self.keys:
+                continue
+            if kind in _KINDS:
+                value = _KINDS[kind](value)
+            if key in manager._state:
+                manager.set_sync(key, value)
+            else:
+                manager._state[key] = manager._adopt(key, value)
+        # Restoring must not be journaled again.
+        self._pending.clear()
+        self._changed.clear()
+
+    def record(self, key: str, patches: list = None):
+        """Called by the StateManager after a key changed."""
+        if self.keys is not None and key not in self.keys:
+            return
+        value = self.manager._state.get(key)
+        if key not in self._stored:
+            # Patches are only meaningful on top of a stored value, so the
+            # first row of a key (e.g. a list created with `create_list`) is
+            # always its whole value.
+            patches = None
+        try:
+            if patches is None:
+                op, data = "set", json.dumps(value._plain() if isinstance(value, Observable) else value)
+            else:
+                op, data = "patch", json.dumps(patches)
+        except (TypeError, ValueError) as e:
+            if key not in self._unserializable:
+                self._unserializable.add(key)
+                print(f"Warning: state '{key}' cannot be persisted: {e}")
+            return
+        self._pending.append((key, self._kind(value), op, data))
+        self._stored.add(key)
+        self._changed.add(key)
+        self._schedule_commit()
+
+    def commit(self):
+        """Writes buffered changes, compacting the journal when it has grown large."""
+        self._commit_scheduled = False
+        if not self._pending or self.conn is None:
+            return
+        rows, self._pending = self._pending, []
+        with self.conn:
+            self.conn.executemany("INSERT INTO state_journal (key, kind, op, value) VALUES (?, ?, ?, ?)", rows)
+        self._journal_rows += len(rows)
+        if self._journal_rows >= self.compact_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Writes the current values of all keys changed since the last snapshot and clears the journal."""
+        if self.conn is None:
+            return
+        rows = []
+        for key in self._changed:
+            value = self.manager._state.get(key)
+            try:
+                data = json.dumps(value._plain() if isinstance(value, Observable) else value)
+            except (TypeError, ValueError):
+                continue
+            rows.append((key, self._kind(value), data))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO state_snapshot (key, kind, value) VALUES (?, ?, ?)", rows
+            )
+            self.conn.execute("DELETE FROM state_journal")
+        self._changed.clear()
+        self._pending.clear()
+        self._journal_rows = 0
+
+    def close(self):
+        """Writes buffered changes and closes the database."""
+        if self.conn is None:
+            return
+        self.commit()
+        if self._connector is not None:
+            self._connector.disconnect()
+        else:
+            self.conn.close()
+        self.conn = None
+        atexit.unregister(self.close)
+        if self.manager._journal is self:
+            self.manager._journal = None
+
+    @staticmethod
+    def _kind(value: Any) -> str:
+        if isinstance(value, ObservableList):
+            return "list"
+        if isinstance(value, ObservableDict):
+            return "dict"
+        return "value"
+
+    def _schedule_commit(self):
+        """Writes buffered changes after `flush_interval`, on whichever event loop is running."""
+        if self._commit_scheduled:
+            return
+        self._commit_scheduled = True
+        try:
+            asyncio.get_running_loop().call_later(self.flush_interval, self.commit)
+            return
+        except RuntimeError:
+            pass
+        if QCoreApplication.instance() is not None:
+            QTimer.singleShot(int(self.flush_interval * 1000), self.commit)
+            return
+        self.commit()
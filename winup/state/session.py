@@ -0,0 +1,165 @@
+# winup/state/session.py
+"""
+Per-session state for the web backend.
+
+Every browser session (identified by a cookie) gets a `SessionState` layered
+over the shared application state. Reads fall through to the shared state
+until the session writes a key; from then on the session holds its own copy
+and changes to it are only broadcast to that session's connections.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .manager import StateManager
+from .observable import Observable
+
+_MISSING = object()
+_HUB_OPTIONS = ("coalesce_window", "max_pending", "send_timeout", "delta_threshold", "history_size")
+
+
+class _CopyOnWrite:
+    """
+    Stands in for the session as the manager of a copy of a shared collection,
+    and gives the session ownership of the copy when it is first changed.
+    """
+    __slots__ = ("session", "value")
+
+    def __init__(self, session: "SessionState", value: Observable):
+        self.session = session
+        self.value = value
+
+    def _apply_patches(self, key: str, patches: list):
+        session = self.session
+        session._copies.pop(key, None)
+        session._state[key] = session._adopt(key, self.value)
+        session._apply_patches(key, patches)
+
+
+class SessionState(StateManager):
+    """The state of one browser session, with copy-on-write access to the shared state."""
+
+    def __init__(self, session_id: str, parent: StateManager, max_keys: Optional[int] = None):
+        super().__init__()
+        self.session_id = session_id
+        self.max_keys = max_keys
+        self.last_seen = time.monotonic()
+        self._parent = parent
+        # {'key': (shared collection, copy handed out)} until either changes.
+        self._copies: dict = {}
+        self._is_web_context = parent._is_web_context
+        self._coalesce = parent._coalesce
+        hub = parent._broadcast_hub
+        self._broadcast_hub.configure(**{name: getattr(hub, name) for name in _HUB_OPTIONS})
+
+    def owns(self, key: str) -> bool:
+        """Whether the session holds its own value for a key."""
+        return key in self._state or key in self._computed
+
+    def _read(self, key: str, default=None):
+        if self.owns(key):
+            return super()._read(key, default)
+        value = self._parent._read(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if isinstance(value, Observable):
+            # Observable collections are changed in place, so the session hands
+            # out a copy. The key stays shared until the copy is changed.
+            cached = self._copies.get(key)
+            if cached is not None and cached[0] is value:
+                return cached[1]
+            copy = type(value)(value._plain())
+            copy._attach(_CopyOnWrite(self, copy), key)
+            self._copies[key] = (value, copy)
+            return copy
+        return value
+
+    def _adopt(self, key: str, value):
+        if key not in self._state and self.max_keys is not None and len(self._state) >= self.max_keys:
+            raise ValueError(f"A session cannot hold more than {self.max_keys} state keys.")
+        return super()._adopt(key, value)
+
+    def remove_web_connection(self, websocket: Any):
+        super().remove_web_connection(websocket)
+        self.last_seen = time.monotonic()
+
+    def is_idle(self, timeout: float, now: float = None) -> bool:
+        """Whether the session has had no connected clients for `timeout` seconds."""
+        if self._web_connections:
+            return False
+        return (now if now is not None else time.monotonic()) - self.last_seen >= timeout
+
+
+class SessionStore:
+    """Creates, looks up and evicts the sessions of a `StateManager`."""
+
+    def __init__(self, parent: StateManager, idle_timeout: float = 1800.0,
+                 max_sessions: Optional[int] = 10000, max_keys: Optional[int] = None):
+        self.parent = parent
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_keys = max_keys
+        # Ordered from least to most recently used.
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+
+    def get(self, session_id: str) -> SessionState:
+        """Returns a session, creating it (and evicting idle ones) if needed."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            self.evict_idle()
+            session = self._sessions[session_id] = SessionState(session_id, self.parent, self.max_keys)
+            if self.max_sessions is not None and len(self._sessions) > self.max_sessions:
+                self._evict_least_recent(len(self._sessions) - self.max_sessions, keep=session_id)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_seen = time.monotonic()
+        return session
+
+    def discard(self, session_id: str):
+        """Drops a session and its state."""
+        self._sessions.pop(session_id, None)
+
+    def evict_idle(self) -> int:
+        """Drops sessions that have been idle for longer than `idle_timeout`. Returns the number dropped."""
+        now = time.monotonic()
+        idle = [sid for sid, session in self._sessions.items() if session.is_idle(self.idle_timeout, now)]
+        for session_id in idle:
+            del self._sessions[session_id]
+        return len(idle)
+
+    def _evict_least_recent(self, count: int, keep: str):
+        """Drops up to `count` of the least recently used sessions without connected clients."""
+        victims = [
+            sid for sid, session in self._sessions.items()
+            if sid != keep and not session._web_connections
+        ][:count]
+        for session_id in victims:
+            del self._sessions[session_id]
+
+    def publish_shared(self, key: str, value: Any, patches: list = None):
+        """Forwards a change of the shared state to every session that has not overridden the key."""
+        for session in self._sessions.values():
+            if session.owns(key):
+                continue
+            session._copies.pop(key, None)
+            if patches is None:
+                session._broadcast_hub.publish(key, value)
+            else:
+                session._broadcast_hub.publish_patches(key, value, patches)
+
+    def watches(self, key: str) -> bool:
+        """Whether a client of any session that reads the shared key receives its updates."""
+        return any(
+            not session.owns(key) and session._broadcast_hub.watches(key)
+            for session in self._sessions.values()
+        )
+
+    def configure_broadcast(self, **options):
+        for session in self._sessions.values():
+            session._broadcast_hub.configure(**options)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
@@ -15,10 +15,12 @@ apply_props = styler.apply_props
 add_style_dict = styler.add_style_dict
 reapply_global_styles = styler.reapply_global_styles
 init_app = styler.init_app
+batch = styler.batch
+configure_style_interning = styler.configure_style_interning
 
 # The 'themes' property is now available directly on the module.
 # It is populated when init_app is called.
 themes = styler.themes
 
 # The styler object itself is also exposed for any remaining internal uses.
-__all__ = ["styler", "apply_props", "add_style_dict", "reapply_global_styles", "init_app", "themes"] 
\ No newline at end of file
+__all__ = ["styler", "apply_props", "add_style_dict", "reapply_global_styles", "init_app", "batch", "configure_style_interning", "themes"] 
\ No newline at end of file
@@ -1,11 +1,18 @@
+import re
 import sys
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
 from PySide6.QtWidgets import QApplication, QWidget, QSizePolicy
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QCursor, QFont
+import shiboken6
 # Import the class, not the module, to avoid the cycle
 from .theming import ThemeManager
-from .tailwind import transpile_tailwind
+from .tailwind import BASE, compile_tailwind, tailwind_class_name
 from winup.ui.layout_managers import VBox, HBox
+from winup.tools.profiler import profiler
 
 # --- Style Constants ---
 # Provide framework-level access to common Qt constants to avoid direct Qt imports in user code.
@@ -52,6 +59,18 @@ FONT_WEIGHT_MAP = {
     "extrabold": QFont.Weight.ExtraBold,
     "black": QFont.Weight.Black,
 }
+# CSS numeric weights, e.g. "600"; Qt uses the same scale.
+FONT_WEIGHT_MAP.update({str(weight.value): weight for weight in list(FONT_WEIGHT_MAP.values())})
+
+# Matches the property name in QSS attribute selectors, e.g. `[variant="primary"]`.
+_ATTRIBUTE_SELECTOR_RE = re.compile(r"\[\s*([A-Za-z_][\w-]*)")
+
+# Number of compiled global stylesheets kept, e.g. one per theme toggled between.
+_QSS_CACHE_SIZE = 8
+
+# Number of not-yet-interned styles whose uses are counted before counting
+# starts over, so apps with many one-off styles don't grow the table forever.
+_MAX_COUNTED_STYLES = 10000
 
 def merge_props(default_props: dict, new_props: dict) -> dict:
     """
@@ -77,6 +96,28 @@ class Styler:
         # The styler will create and own the theme manager.
         self.themes: ThemeManager = None
         self._styled_widgets = {}
+        # Widget properties that QSS selectors depend on. Only changes to these
+        # need a repolish for the new value to show up.
+        self._selector_properties = {"class", "objectName"}
+        # Bumped whenever `_definitions` changes. The compiled global stylesheet
+        # is cached per (definitions version, theme).
+        self._version = 0
+        self._qss_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._batch_depth = 0
+        self._reapply_pending = False
+        # Style interning: identical inline styles become one shared rule.
+        self._intern_min_uses = 0
+        self._interned = {}
+        # Class name -> the rules it stands for
+        self._interned_rules = {}
+        self._style_uses = {}
+        # (widget type, class) pairs whose Tailwind rules are in the global stylesheet.
+        self._tailwind_rules = set()
+        # Theme dependency index: variable name -> widgets whose inline style
+        # uses it, and the variables used by the global stylesheet.
+        self._theme_dependents: dict = {}
+        self._global_variables = set()
+        self._global_variables_version = -1
 
     def init_app(self, app: QApplication):
         """
@@ -105,28 +146,92 @@ class Styler:
         """
         Adds a dictionary of styles to the application.
         The dictionary is converted to a QSS string and applied globally.
+
+        Applying a global stylesheet restyles every widget, so the update is
+        deferred until control returns to the event loop: any number of calls
+        in a row cost a single restyle. Styles that are already defined are
+        skipped. Call `reapply_global_styles()` to apply them immediately.
+
+        This includes the rules WinUp adds itself for interned styles and
+        Tailwind state variants. Without a running event loop (e.g. a script
+        that grabs widgets without calling `app.exec()`), they only apply once
+        `reapply_global_styles()` is called; a `Window` does so when shown.
         """
+        changed = False
         for selector, rules in styles.items():
-            if selector not in self._definitions:
-                self._definitions[selector] = {}
-            self._definitions[selector].update(rules)
-        
+            definition = self._definitions.get(selector)
+            if definition is None:
+                definition = self._definitions[selector] = {}
+                self._selector_properties.update(_ATTRIBUTE_SELECTOR_RE.findall(selector))
+                changed = True
+            for prop, value in rules.items():
+                if prop not in definition or definition[prop] != value:
+                    definition[prop] = value
+                    changed = True
+        if not changed:
+            return
+        self._version += 1
+
         # Only reapply styles if the application is already running.
         # Otherwise, init_app will handle it.
         if self._app:
+            self._schedule_reapply()
+
+    @contextmanager
+    def batch(self):
+        """
+        Applies all global style changes made inside the `with` block at
+        once, when the block ends:
+
+            with style.batch():
+                style.add_style_dict(BUTTON_STYLES)
+                style.add_style_dict(CARD_STYLES)
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._reapply_pending:
+                self.reapply_global_styles()
+
+    def _schedule_reapply(self):
+        if self._reapply_pending:
+            return
+        self._reapply_pending = True
+        if self._batch_depth == 0:
+            QTimer.singleShot(0, self._apply_pending)
+
+    def _apply_pending(self):
+        if self._reapply_pending and self._batch_depth == 0:
             self.reapply_global_styles()
 
+    def compiled_qss(self) -> str:
+        """Returns the global stylesheet for the active theme, compiling it if needed."""
+        cache_key = (self._version, self.themes.get_active_theme_name(), self.themes.revision)
+        qss = self._qss_cache.get(cache_key)
+        if qss is None:
+            themed_styles = self.themes.substitute_variables(self._definitions)
+            qss = self._qss_cache[cache_key] = self._to_qss(themed_styles)
+            if len(self._qss_cache) > _QSS_CACHE_SIZE:
+                self._qss_cache.popitem(last=False)
+        else:
+            self._qss_cache.move_to_end(cache_key)
+        return qss
+
     def reapply_global_styles(self):
         """
         Substitutes theme variables in all defined styles and reapplies
-        the global stylesheet.
+        the global stylesheet. Nothing is done if it has not changed.
         """
         if not self._app:
             return
-            
-        themed_styles = self.themes.substitute_variables(self._definitions)
-        qss = self._to_qss(themed_styles)
-        self._app.setStyleSheet(qss)
+        self._reapply_pending = False
+
+        qss = self.compiled_qss()
+        # setStyleSheet restyles every widget in the app, even for the same QSS.
+        if self._app.styleSheet() != qss:
+            self._app.setStyleSheet(qss)
 
     def add_style(self, widget, style_class: str):
         """
@@ -188,13 +293,180 @@ class Styler:
             parts.append(f"{selector} {{ {rules_str}; }}")
         return "\n".join(parts)
 
+    def update_theme(self, previous: dict = None):
+        """
+        Restyles what depends on the theme variables whose values differ
+        between `previous` and the active theme: the global stylesheet, if
+        its rules use one of them, and widgets with inline styles that do.
+        Windows don't repaint until all updates are done. Without `previous`,
+        everything that uses a variable is restyled.
+        """
+        if not self._app:
+            return
+        current = self.themes._active_theme
+        if previous is None:
+            changed = None
+        else:
+            changed = {name for name in previous.keys() | current.keys() if previous.get(name) != current.get(name)}
+            if not changed:
+                return
+
+        widgets = set()
+        for name, dependents in self._theme_dependents.items():
+            if changed is None or name in changed:
+                widgets.update(dependents)
+
+        windows = [window for window in self._app.topLevelWidgets() if window.isVisible() and window.updatesEnabled()]
+        for window in windows:
+            window.setUpdatesEnabled(False)
+        try:
+            if changed is None or not changed.isdisjoint(self._variables_in_definitions()):
+                self.reapply_global_styles()
+            for widget in widgets:
+                if shiboken6.isValid(widget):
+                    self._update_themed_styles(widget)
+        finally:
+            for window in windows:
+                window.setUpdatesEnabled(True)
+
+        # Pooled widgets were styled for the previous theme.
+        from winup.core.pool import pool
+        pool.clear()
+
+    def _variables_in_definitions(self) -> set:
+        if self._global_variables_version != self._version:
+            names = set()
+            for rules in self._definitions.values():
+                for value in rules.values():
+                    if isinstance(value, str):
+                        names.update(self.themes.variables_in(value))
+            self._global_variables = names
+            self._global_variables_version = self._version
+        return self._global_variables
+
+    def _track_themed_style(self, widget, template: str, applied: str):
+        """Records an inline style that uses theme variables, so theme changes update it."""
+        entries = vars(widget).setdefault("_winup_themed_styles", [])
+        entries.append([template, applied])
+        for name in self.themes.variables_in(template):
+            dependents = self._theme_dependents.get(name)
+            if dependents is None:
+                dependents = self._theme_dependents[name] = weakref.WeakSet()
+            dependents.add(widget)
+
+    def _update_themed_styles(self, widget):
+        current = style_sheet = widget.styleSheet()
+        entries = vars(widget).get("_winup_themed_styles", [])
+        for entry in list(entries):
+            template, applied = entry
+            if applied not in current:
+                # The stylesheet was replaced; the themed part is gone.
+                entries.remove(entry)
+                continue
+            updated = self.themes.substitute(template)
+            if updated != applied:
+                current = current.replace(applied, updated, 1)
+                entry[1] = updated
+        if current != style_sheet:
+            widget.setStyleSheet(current)
+
+    def configure_style_interning(self, min_uses: int = 2):
+        """
+        Shares the CSS props of widgets through the global stylesheet instead
+        of giving each widget its own stylesheet. Once `min_uses` widgets of
+        the same type have been given the same CSS props, the props become a
+        rule in the global stylesheet and further widgets only get its class.
+        Styles used less often stay inline. 0 turns interning off.
+        """
+        self._intern_min_uses = max(0, min_uses)
+        self._style_uses.clear()
+
+    @staticmethod
+    def _generated_class(widget, prefix: str) -> Optional[str]:
+        """Returns the class WinUp generated with `prefix` ("wu-s" or "tw-") on a widget, if any."""
+        for name in (widget.property("class") or "").split():
+            if name.startswith(prefix):
+                return name
+        return None
+
+    def _set_generated_class(self, widget, prefix: str, name: str):
+        """Gives a widget the generated class `name`, replacing the one it had with the same prefix."""
+        classes = (widget.property("class") or "").split()
+        updated = [c for c in classes if not c.startswith(prefix)] + [name]
+        if updated == classes:
+            return
+        widget.setProperty("class", " ".join(updated))
+        if widget.testAttribute(Qt.WidgetAttribute.WA_WState_Polished):
+            self.repolish(widget)
+
+    def _apply_tailwind_rules(self, widget, tailwind_string: str, rules: dict) -> dict:
+        """
+        Styles a widget whose Tailwind classes have state variants, e.g.
+        `hover:bg-blue-600`. Those need selectors, so the rules go into the
+        global stylesheet under a class shared by all widgets of this type
+        with the same class string. Returns the props to apply directly.
+        """
+        type_name = widget.metaObject().className()
+        name = tailwind_class_name(tailwind_string)
+        if (type_name, name) not in self._tailwind_rules:
+            self._tailwind_rules.add((type_name, name))
+            styles = {}
+            for (_, pseudo), declarations in rules.items():
+                declarations = {prop: value for prop, value in declarations.items() if prop != "flex"}
+                if declarations:
+                    styles[f'{type_name}[class~="{name}"]{pseudo}'] = declarations
+            # Applied with the next deferred restyle, like any global style.
+            self.add_style_dict(styles)
+        self._set_generated_class(widget, "tw-", name)
+        # `flex` is a layout stretch factor, not QSS.
+        return {prop: value for prop, value in rules.get(BASE, {}).items() if prop == "flex"}
+
+    def _intern_style(self, widget, rules: dict):
+        """Returns the shared class for `rules` on this type of widget, or None to style it inline."""
+        type_name = widget.metaObject().className()
+        style_key = (type_name, tuple(rules.items()))
+        name = self._interned.get(style_key)
+        if name is None:
+            uses = self._style_uses.get(style_key, 0) + 1
+            if uses < self._intern_min_uses:
+                if len(self._style_uses) >= _MAX_COUNTED_STYLES:
+                    self._style_uses.clear()
+                self._style_uses[style_key] = uses
+                return None
+            self._style_uses.pop(style_key, None)
+            name = self._interned[style_key] = f"wu-s{len(self._interned)}"
+            self._interned_rules[name] = rules
+            # The rule keeps its theme variables, so it follows theme changes.
+            # Restyling costs time per live widget, so the rule is applied with
+            # the next deferred restyle rather than once per new rule.
+            self.add_style_dict({f'{type_name}[class~="{name}"]': rules})
+        return name
+
+    def affects_style(self, property_name: str) -> bool:
+        """
+        Returns True if a QSS selector depends on the given widget property,
+        i.e. changing it requires a repolish to update the widget's style.
+        """
+        return property_name in self._selector_properties
+
     def repolish(self, widget):
         """Triggers a style re-computation for the widget."""
         widget.style().unpolish(widget)
         widget.style().polish(widget)
+        profiler.record_repolish()
 
     def apply_props(self, widget, props: dict):
         """Applies a dictionary of properties to a widget."""
+        profile = profiler.render_profile
+        if profile is None:
+            return self._apply_props(widget, props)
+        profile.enter("styler.apply_props")
+        try:
+            return self._apply_props(widget, props)
+        finally:
+            profile.exit()
+
+    def _apply_props(self, widget, props: dict):
         if not self._app and QApplication.instance():
             self.init_app(QApplication.instance())
 
@@ -202,15 +474,23 @@ class Styler:
         if props is None:
             props = {}
 
+        if "key" in props:
+            # Identifies the widget among its siblings when a component re-renders.
+            from winup.core.reconcile import set_key
+            set_key(widget, props.pop("key"))
+
         tailwind_props = {}
         if 'tailwind' in props:
             tailwind_string = props.pop('tailwind')
-            # Assuming 'desktop' for now. This will need to be dynamic later.
-            tailwind_props = transpile_tailwind(tailwind_string, platform='desktop')
+            rules = compile_tailwind(tailwind_string, platform='desktop')
+            if any(selector != BASE for selector in rules):
+                tailwind_props = self._apply_tailwind_rules(widget, tailwind_string, rules)
+            else:
+                tailwind_props = rules.get(BASE, {})
 
-        themed_props = self.themes.substitute_variables(props) if props else {}
         # Merge Tailwind props with other props
-        themed_props = {**tailwind_props, **themed_props}
+        raw_props = {**tailwind_props, **props}
+        themed_props = self.themes.substitute_variables(raw_props) if raw_props else {}
 
         # Handle special properties first
         if "class" in themed_props:
@@ -294,6 +574,17 @@ class Styler:
                 print(f"Warning: Invalid flex value '{flex_value}', expected integer.", file=sys.stderr)
 
         # The rest of the props are assumed to be direct CSS properties
+        if themed_props and self._intern_min_uses and not widget.styleSheet():
+            rules = {key.replace('_', '-'): str(raw_props[key]) for key in themed_props}
+            current = self._generated_class(widget, "wu-s")
+            if current is not None:
+                # Props applied again add to the earlier ones, as inline styles do.
+                rules = {**self._interned_rules.get(current, {}), **rules}
+            style_class = self._intern_style(widget, rules)
+            if style_class:
+                self._set_generated_class(widget, "wu-s", style_class)
+                return
+
         style_str = ""
         for key, value in themed_props.items():
             css_key = key.replace('_', '-')
@@ -304,6 +595,9 @@ class Styler:
             if existing_style and not existing_style.endswith(';'):
                 existing_style += ';'
             widget.setStyleSheet(existing_style + " " + style_str)
+            if any(isinstance(raw_props[key], str) and "$" in raw_props[key] for key in themed_props):
+                template = "".join(f"{key.replace('_', '-')}: {raw_props[key]};" for key in themed_props)
+                self._track_themed_style(widget, template, style_str)
 
 # Singleton instance
 styler = Styler() 
\ No newline at end of file
@@ -1,71 +1,370 @@
-# Shared base styles for web (desktop will get converted)
-BASE_CLASSES_WEB = {
-    'bg-blue-500': {'background-color': '#3B82F6'},
-    'text-black': {'color': '#000000'},
-    'text-white': {'color': '#FFFFFF'},
-    'w-1/2': {'width': '50%'},
-    "text-xl": {'font-size': '1.25rem', 'line-height': '1.75rem'},
-    "text-lg": {'font-size': '1.125rem', 'line-height': '1.75rem'},
-    "text-sm": {'font-size': '0.875rem', 'line-height': '1.25rem'},
-    "text-base": {'font-size': '1rem', 'line-height': '1.5rem'},
-    "text-xs": {'font-size': '0.75rem', 'line-height': '1rem'},
-    "font-bold": {'font-weight': 'bold'},
-    "font-medium": {'font-weight': '500'},
-    "font-light": {'font-weight': '300'},
+"""
+Tailwind-style utility classes for desktop (QSS) and web (CSS) styling.
+
+Utilities are generated from scales rather than listed one by one: spacing
+(`p-4`, `mx-2.5`, `-mt-1`, `w-1/2`), colors (`bg-sky-600`, `text-red-500/50`),
+typography (`text-xl`, `font-semibold`), borders (`border-2`, `rounded-lg`)
+and flex (`flex-1`). Arbitrary values go in brackets, e.g. `p-[13px]` or
+`bg-[$primary-color]`.
+
+A class may be prefixed with variants, e.g. `hover:bg-blue-600` or
+`md:p-8`. State variants become pseudo-states (`:hover`, `:pressed`, ...),
+responsive variants become `min-width` media queries. QSS has no media
+queries, so responsive variants only apply on the web.
+
+A class string is parsed once per platform; the result is cached, so the
+same string used by thousands of widgets costs a dictionary lookup.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# (media query, pseudo-state) -> declarations. ("", "") holds the base style.
+Rules = Dict[Tuple[str, str], Dict[str, str]]
+
+BASE = ("", "")
+
+# --- Colors ---
+
+_SHADES = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950)
+
+_PALETTE = {
+    "slate": "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617",
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712",
+    "zinc": "fafafa f4f4f5 e4e4e7 d4d4d8 a1a1aa 71717a 52525b 3f3f46 27272a 18181b 09090b",
+    "neutral": "fafafa f5f5f5 e5e5e5 d4d4d4 a3a3a3 737373 525252 404040 262626 171717 0a0a0a",
+    "stone": "fafaf9 f5f5f4 e7e5e4 d6d3d1 a8a29e 78716c 57534e 44403c 292524 1c1917 0c0a09",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a",
+    "orange": "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407",
+    "amber": "fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f 451a03",
+    "yellow": "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12 422006",
+    "lime": "f7fee7 ecfccb d9f99d bef264 a3e635 84cc16 65a30d 4d7c0f 3f6212 365314 1a2e05",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16",
+    "emerald": "ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b 022c22",
+    "teal": "f0fdfa ccfbf1 99f6e4 5eead4 2dd4bf 14b8a6 0d9488 0f766e 115e59 134e4a 042f2e",
+    "cyan": "ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63 083344",
+    "sky": "f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e 082f49",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b",
+    "violet": "f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95 2e1065",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764",
+    "fuchsia": "fdf4ff fae8ff f5d0fe f0abfc e879f9 d946ef c026d3 a21caf 86198f 701a75 4a044e",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724",
+    "rose": "fff1f2 ffe4e6 fecdd3 fda4af fb7185 f43f5e e11d48 be123c 9f1239 881337 4c0519",
 }
 
-# rem → px conversion for desktop (16px base)
-REM_TO_PX = {
-    "1.25rem": "20px",
-    "1.75rem": "28px",
-    "1.125rem": "18px",
-    "0.875rem": "14px",
-    "1rem": "16px",
-    "1.5rem": "24px",
-    "0.75rem": "12px",
+COLORS = {"black": "#000000", "white": "#FFFFFF", "transparent": "transparent"}
+for _name, _hexes in _PALETTE.items():
+    for _shade, _hex in zip(_SHADES, _hexes.split()):
+        COLORS[f"{_name}-{_shade}"] = f"#{_hex.upper()}"
+
+# --- Scales ---
+
+# Font size and line height in rem; desktop sizes are converted to px.
+FONT_SIZES = {
+    "xs": (0.75, 1), "sm": (0.875, 1.25), "base": (1, 1.5), "lg": (1.125, 1.75),
+    "xl": (1.25, 1.75), "2xl": (1.5, 2), "3xl": (1.875, 2.25), "4xl": (2.25, 2.5),
+    "5xl": (3, 1), "6xl": (3.75, 1), "7xl": (4.5, 1), "8xl": (6, 1), "9xl": (8, 1),
 }
 
-# Build desktop base styles by replacing rem with px
-BASE_CLASSES_DESKTOP = {}
-for cls, styles in BASE_CLASSES_WEB.items():
-    converted = {}
-    for k, v in styles.items():
-        if isinstance(v, str) and v.endswith("rem"):
-            converted[k] = REM_TO_PX.get(v, v)  # convert if in map
-        else:
-            converted[k] = v
-    BASE_CLASSES_DESKTOP[cls] = converted
+FONT_WEIGHTS = {
+    "thin": "100", "extralight": "200", "light": "300", "normal": "400", "medium": "500",
+    "semibold": "600", "bold": "bold", "extrabold": "800", "black": "900",
+}
 
-# Units for padding & margin
-SCALE_UNITS = {
+# Border radius in px.
+RADII = {"none": 0, "sm": 2, "": 4, "md": 6, "lg": 8, "xl": 12, "2xl": 16, "3xl": 24, "full": 9999}
+
+BREAKPOINTS = {"sm": 640, "md": 768, "lg": 1024, "xl": 1280, "2xl": 1536}
+
+# Variant -> pseudo-state. Qt calls the state of a held-down button `:pressed`.
+STATE_VARIANTS = {
     "desktop": {
-        'p-4': {'padding': '16px'},
-        'p-2': {'padding': '8px'},
-        'p-1': {'padding': '4px'},
-        'p-0': {'padding': '0px'},
-        'm-4': {'margin': '16px'},
-        'm-2': {'margin': '8px'},
-        'm-1': {'margin': '4px'},
-        'm-0': {'margin': '0px'},
+        "hover": ":hover", "focus": ":focus", "active": ":pressed", "disabled": ":disabled",
+        "enabled": ":enabled", "checked": ":checked",
     },
     "web": {
-        'p-4': {'padding': '1rem'},
-        'p-2': {'padding': '0.5rem'},
-        'p-1': {'padding': '0.25rem'},
-        'p-0': {'padding': '0rem'},
-        'm-4': {'margin': '1rem'},
-        'm-2': {'margin': '0.5rem'},
-        'm-1': {'margin': '0.25rem'},
-        'm-0': {'margin': '0rem'},
-    }
+        "hover": ":hover", "focus": ":focus", "focus-visible": ":focus-visible", "active": ":active",
+        "disabled": ":disabled", "enabled": ":enabled", "checked": ":checked",
+        "first": ":first-child", "last": ":last-child",
+    },
 }
 
-# Merge into platform mappings
-TAILWIND_TO_STYLE = {
-    "desktop": {**BASE_CLASSES_DESKTOP, **SCALE_UNITS["desktop"]},
-    "web": {**BASE_CLASSES_WEB, **SCALE_UNITS["web"]},
+_SPACING_PROPERTIES = {
+    "p": ("padding",), "px": ("padding-left", "padding-right"), "py": ("padding-top", "padding-bottom"),
+    "pt": ("padding-top",), "pr": ("padding-right",), "pb": ("padding-bottom",), "pl": ("padding-left",),
+    "m": ("margin",), "mx": ("margin-left", "margin-right"), "my": ("margin-top", "margin-bottom"),
+    "mt": ("margin-top",), "mr": ("margin-right",), "mb": ("margin-bottom",), "ml": ("margin-left",),
+    "w": ("width",), "h": ("height",), "size": ("width", "height"),
+    "min-w": ("min-width",), "min-h": ("min-height",), "max-w": ("max-width",), "max-h": ("max-height",),
+    "gap": ("gap",), "gap-x": ("column-gap",), "gap-y": ("row-gap",),
 }
 
+_BORDER_SIDES = {
+    "border": ("",), "border-x": ("-left", "-right"), "border-y": ("-top", "-bottom"),
+    "border-t": ("-top",), "border-r": ("-right",), "border-b": ("-bottom",), "border-l": ("-left",),
+}
+
+_RADIUS_CORNERS = {
+    "rounded": ("border-radius",),
+    "rounded-t": ("border-top-left-radius", "border-top-right-radius"),
+    "rounded-r": ("border-top-right-radius", "border-bottom-right-radius"),
+    "rounded-b": ("border-bottom-left-radius", "border-bottom-right-radius"),
+    "rounded-l": ("border-top-left-radius", "border-bottom-left-radius"),
+    "rounded-tl": ("border-top-left-radius",), "rounded-tr": ("border-top-right-radius",),
+    "rounded-br": ("border-bottom-right-radius",), "rounded-bl": ("border-bottom-left-radius",),
+}
+
+# Utilities without a value. Desktop entries only use what QSS (or the
+# styler's `flex` prop) supports.
+_KEYWORDS_COMMON = {
+    "italic": {"font-style": "italic"}, "not-italic": {"font-style": "normal"},
+    "underline": {"text-decoration": "underline"}, "line-through": {"text-decoration": "line-through"},
+    "no-underline": {"text-decoration": "none"},
+    "text-left": {"text-align": "left"}, "text-center": {"text-align": "center"},
+    "text-right": {"text-align": "right"},
+    "font-sans": {"font-family": "sans-serif"}, "font-serif": {"font-family": "serif"},
+    "font-mono": {"font-family": "monospace"},
+    "border-solid": {"border-style": "solid"}, "border-dashed": {"border-style": "dashed"},
+    "border-dotted": {"border-style": "dotted"}, "border-none": {"border-style": "none"},
+}
+KEYWORDS = {
+    "desktop": {
+        **_KEYWORDS_COMMON,
+        # Stretch factor in the parent Row/Column, see `flex` in the props reference.
+        "flex-1": {"flex": "1"}, "grow": {"flex": "1"},
+    },
+    "web": {
+        **_KEYWORDS_COMMON,
+        "text-justify": {"text-align": "justify"},
+        "uppercase": {"text-transform": "uppercase"}, "lowercase": {"text-transform": "lowercase"},
+        "capitalize": {"text-transform": "capitalize"},
+        "block": {"display": "block"}, "inline-block": {"display": "inline-block"},
+        "inline": {"display": "inline"}, "flex": {"display": "flex"}, "inline-flex": {"display": "inline-flex"},
+        "grid": {"display": "grid"}, "hidden": {"display": "none"},
+        "flex-row": {"flex-direction": "row"}, "flex-col": {"flex-direction": "column"},
+        "flex-row-reverse": {"flex-direction": "row-reverse"}, "flex-col-reverse": {"flex-direction": "column-reverse"},
+        "flex-wrap": {"flex-wrap": "wrap"}, "flex-nowrap": {"flex-wrap": "nowrap"},
+        "flex-1": {"flex": "1 1 0%"}, "flex-auto": {"flex": "1 1 auto"}, "flex-none": {"flex": "none"},
+        "grow": {"flex-grow": "1"}, "grow-0": {"flex-grow": "0"},
+        "shrink": {"flex-shrink": "1"}, "shrink-0": {"flex-shrink": "0"},
+        "items-start": {"align-items": "flex-start"}, "items-center": {"align-items": "center"},
+        "items-end": {"align-items": "flex-end"}, "items-stretch": {"align-items": "stretch"},
+        "items-baseline": {"align-items": "baseline"},
+        "justify-start": {"justify-content": "flex-start"}, "justify-center": {"justify-content": "center"},
+        "justify-end": {"justify-content": "flex-end"}, "justify-between": {"justify-content": "space-between"},
+        "justify-around": {"justify-content": "space-around"}, "justify-evenly": {"justify-content": "space-evenly"},
+        "cursor-pointer": {"cursor": "pointer"},
+    },
+}
+
+# Properties only the web supports; utilities producing them are skipped on desktop.
+_WEB_ONLY = {"gap", "column-gap", "row-gap", "opacity", "line-height", "letter-spacing"}
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_FRACTION_RE = re.compile(r"(\d+)/(\d+)")
+_LENGTH_RE = re.compile(r"-?\d*\.?\d+(?:px|rem|em|%|pt|vh|vw)?")
+_REM_RE = re.compile(r"(\d*\.?\d+)rem")
+_PREFIXES = sorted(
+    {*_SPACING_PROPERTIES, *_BORDER_SIDES, *_RADIUS_CORNERS, "bg", "text", "font", "opacity", "leading", "tracking"},
+    key=len, reverse=True,
+)
+
+
+def _num(value: float) -> str:
+    return f"{value:g}"
+
+
+def _length(rem: float, platform: str) -> str:
+    """A length given in rem, in px on desktop (16px per rem)."""
+    return f"{_num(rem * 16)}px" if platform == "desktop" else f"{_num(rem)}rem"
+
+
+def _spacing(value: str, platform: str, negative: bool) -> Optional[str]:
+    if value == "px":
+        length = "1px"
+    elif _NUMBER_RE.fullmatch(value):
+        length = _length(float(value) / 4, platform)
+    elif _FRACTION_RE.fullmatch(value):
+        numerator, denominator = map(int, value.split("/"))
+        if not denominator:
+            return None
+        length = f"{_num(round(numerator / denominator * 100, 6))}%"
+    elif value in ("full", "auto"):
+        length = "100%" if value == "full" else "auto"
+    else:
+        return None
+    return f"-{length}" if negative and length not in ("0px", "0rem", "auto") else length
+
+
+def _color(value: str) -> Optional[str]:
+    color, _, alpha = value.partition("/")
+    color = COLORS.get(color)
+    if color is None or not alpha:
+        return color
+    if not alpha.isdigit() or not color.startswith("#"):
+        return None
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({r}, {g}, {b}, {_num(int(alpha) / 100)})"
+
+
+def _arbitrary(prefix: str, value: str, platform: str) -> Optional[Dict[str, str]]:
+    """Handles `prefix-[value]`, e.g. `p-[13px]` or `bg-[#1E293B]`."""
+    if platform == "desktop":
+        # QSS has no rem.
+        value = _REM_RE.sub(lambda m: f"{_num(float(m.group(1)) * 16)}px", value)
+    is_length = _LENGTH_RE.fullmatch(value) is not None
+    if prefix in _SPACING_PROPERTIES:
+        return dict.fromkeys(_SPACING_PROPERTIES[prefix], value)
+    if prefix == "bg":
+        return {"background-color": value}
+    if prefix == "text":
+        return {"font-size": value} if is_length else {"color": value}
+    if prefix in _BORDER_SIDES:
+        if is_length:
+            return _border_width(prefix, value)
+        return {f"border{side}-color": value for side in _BORDER_SIDES[prefix]}
+    if prefix in _RADIUS_CORNERS:
+        return dict.fromkeys(_RADIUS_CORNERS[prefix], value)
+    if prefix == "font":
+        return {"font-weight": value} if value.isdigit() else {"font-family": value}
+    if prefix == "opacity":
+        return {"opacity": value}
+    if prefix == "leading":
+        return {"line-height": value}
+    if prefix == "tracking":
+        return {"letter-spacing": value}
+    return None
+
+
+def _border_width(prefix: str, width: str) -> Dict[str, str]:
+    declarations = {}
+    for side in _BORDER_SIDES[prefix]:
+        declarations[f"border{side}-width"] = width
+        declarations[f"border{side}-style"] = "solid"
+    return declarations
+
+
+def _utility(name: str, platform: str) -> Optional[Dict[str, str]]:
+    """Returns the declarations of a single utility class, or None if it is unknown."""
+    keyword = KEYWORDS[platform].get(name)
+    if keyword is not None:
+        return keyword
+
+    negative = name.startswith("-")
+    if negative:
+        name = name[1:]
+    prefix = value = None
+    for candidate in _PREFIXES:
+        if name == candidate:
+            prefix, value = candidate, ""
+            break
+        if name.startswith(candidate + "-"):
+            prefix, value = candidate, name[len(candidate) + 1:]
+            break
+    if prefix is None:
+        return None
+
+    if value.startswith("[") and value.endswith("]"):
+        value = value[1:-1].replace("_", " ")
+        # Keeps generated CSS from closing the surrounding <style> or rule.
+        if not value or any(char in value for char in "<>{};"):
+            return None
+        return _arbitrary(prefix, value, platform)
+
+    if negative and not _SPACING_PROPERTIES.get(prefix, ("",))[0].startswith("margin"):
+        # Only margins can be negative, e.g. `-mt-2`.
+        return None
+    if prefix in _SPACING_PROPERTIES:
+        length = _spacing(value, platform, negative)
+        if length is None:
+            return None
+        return dict.fromkeys(_SPACING_PROPERTIES[prefix], length)
+    if prefix == "bg":
+        color = _color(value)
+        return {"background-color": color} if color else None
+    if prefix == "text":
+        if value in FONT_SIZES:
+            size, line_height = FONT_SIZES[value]
+            if platform == "desktop":
+                return {"font-size": _length(size, platform)}
+            return {"font-size": _length(size, platform), "line-height": _length(line_height, platform)}
+        color = _color(value)
+        return {"color": color} if color else None
+    if prefix == "font":
+        weight = FONT_WEIGHTS.get(value)
+        return {"font-weight": weight} if weight else None
+    if prefix in _BORDER_SIDES:
+        if value == "":
+            return _border_width(prefix, "1px")
+        if value.isdigit():
+            return _border_width(prefix, f"{value}px")
+        color = _color(value)
+        if color is None:
+            return None
+        return {f"border{side}-color": color for side in _BORDER_SIDES[prefix]}
+    if prefix in _RADIUS_CORNERS:
+        if value not in RADII:
+            return None
+        return dict.fromkeys(_RADIUS_CORNERS[prefix], f"{RADII[value]}px")
+    if prefix == "opacity" and value.isdigit():
+        return {"opacity": _num(int(value) / 100)}
+    if prefix == "leading" and _NUMBER_RE.fullmatch(value):
+        return {"line-height": _length(float(value) / 4, platform)}
+    return None
+
+
+def _split_variants(token: str) -> list:
+    """Splits `md:hover:bg-[url(a:b)]` at the colons outside brackets."""
+    if "[" not in token:
+        return token.split(":")
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(token):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == ":" and depth == 0:
+            parts.append(token[start:i])
+            start = i + 1
+    parts.append(token[start:])
+    return parts
+
+
+@lru_cache(maxsize=1024)
+def compile_tailwind(tailwind_string: str, platform: str = 'desktop') -> Rules:
+    """
+    Parses a class string into rules: `{(media query, pseudo-state): declarations}`,
+    with the base style under `("", "")`. Unknown classes are ignored.
+
+    The result is cached and shared, so it must not be modified.
+    """
+    if platform not in KEYWORDS:
+        return {}
+    states = STATE_VARIANTS[platform]
+    rules: Rules = {}
+    for token in tailwind_string.split():
+        *variants, name = _split_variants(token)
+        media, pseudo = "", ""
+        for variant in variants:
+            if variant in BREAKPOINTS:
+                media = f"(min-width: {BREAKPOINTS[variant]}px)"
+            elif variant in states:
+                pseudo += states[variant]
+            else:
+                break
+        else:
+            declarations = _utility(name, platform)
+            if declarations is None:
+                continue
+            if platform == "desktop":
+                if media:
+                    continue
+                declarations = {k: v for k, v in declarations.items() if k not in _WEB_ONLY}
+            rules.setdefault((media, pseudo), {}).update(declarations)
+    return rules
+
 
 def transpile_tailwind(tailwind_string: str, platform: str = 'desktop'):
     """
@@ -76,15 +375,33 @@ def transpile_tailwind(tailwind_string: str, platform: str = 'desktop'):
         platform: The target platform ('desktop' for PySide6 QSS or 'web' for CSS).
 
     Returns:
-        A dictionary of style properties.
+        A dictionary of style properties. Variants are nested under their
+        pseudo-state (e.g. ":hover") and media query (e.g. "@media (min-width: 768px)").
     """
     style_dict = {}
-    classes = tailwind_string.split()
+    for (media, pseudo), declarations in compile_tailwind(tailwind_string, platform).items():
+        target = style_dict.setdefault(f"@media {media}", {}) if media else style_dict
+        if pseudo:
+            target = target.setdefault(pseudo, {})
+        target.update(declarations)
+    return style_dict
 
-    mappings = TAILWIND_TO_STYLE.get(platform, {})
 
-    for cls in classes:
-        if cls in mappings:
-            style_dict.update(mappings[cls])
+@lru_cache(maxsize=1024)
+def tailwind_class_name(tailwind_string: str) -> str:
+    """A stable class name for the rules of a class string, e.g. `tw-3f9a0c12e4b1`."""
+    return "tw-" + hashlib.blake2b(tailwind_string.encode(), digest_size=6).hexdigest()
 
-    return style_dict
+
+def rules_to_css(selector: str, rules: Rules) -> str:
+    """Writes rules as CSS for `selector`, media queries last and in breakpoint order."""
+    def media_order(item):
+        media = item[0][0]
+        return int(re.sub(r"\D", "", media)) if media else 0
+
+    blocks = []
+    for (media, pseudo), declarations in sorted(rules.items(), key=media_order):
+        body = "; ".join(f"{prop}: {value}" for prop, value in declarations.items())
+        rule = f"{selector}{pseudo} {{ {body}; }}"
+        blocks.append(f"@media {media} {{ {rule} }}" if media else rule)
+    return "\n".join(blocks)
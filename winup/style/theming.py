@@ -1,5 +1,12 @@
 # winup/style/theming.py
-from typing import Dict, Optional
+import re
+from typing import Dict, Optional, Tuple
+
+# A theme variable reference, e.g. `$primary-color`.
+_VARIABLE_RE = re.compile(r"\$([A-Za-z_][\w-]*)")
+
+# Number of distinct style strings kept compiled/substituted before the caches start over.
+_MAX_CACHED_VALUES = 4096
 
 # Default Light Theme
 LIGHT_THEME = {
@@ -80,14 +87,28 @@ class ThemeManager:
         }
         self._active_theme_name = "light"
         self._active_theme = self._themes["light"]
+        # Bumped when a theme is added or replaced, invalidating compiled styles.
+        self.revision = 0
+        # Style strings split into literal text and variable names, and their
+        # values in the active theme. Only the second depends on the theme.
+        self._templates: Dict[str, Tuple[str, ...]] = {}
+        self._substituted: Dict[str, str] = {}
 
     def add_theme(self, name: str, theme_dict: Dict[str, str]):
-        """Adds a new theme definition."""
+        """Adds a new theme definition. Replacing the active theme restyles the app."""
         self._themes[name] = theme_dict
+        self.revision += 1
         print(f"Theme '{name}' added.")
+        if name == self._active_theme_name:
+            previous, self._active_theme = self._active_theme, theme_dict
+            self._substituted.clear()
+            self._styler.update_theme(previous)
 
     def set_theme(self, name: str, _force_reapply: bool = True):
-        """Sets the active theme for the application and triggers a global restyle."""
+        """
+        Sets the active theme for the application and restyles what uses the
+        variables whose values change.
+        """
         if name not in self._themes:
             raise ValueError(f"Theme '{name}' not found. Available themes: {list(self._themes.keys())}")
         
@@ -96,12 +117,15 @@ class ThemeManager:
             return
             
         print(f"Switching to theme: {name}")
+        previous = self._active_theme
         self._active_theme_name = name
         self._active_theme = self._themes[name]
+        self._substituted.clear()
         
-        # Trigger a global restyle only if requested
+        # Trigger a restyle only if requested. Re-setting the active theme
+        # restyles everything that uses a variable.
         if _force_reapply:
-            self._styler.reapply_global_styles()
+            self._styler.update_theme(previous if previous is not self._active_theme else None)
 
     def get_active_theme_name(self) -> str:
         """Returns the name of the currently active theme."""
@@ -116,6 +140,41 @@ class ThemeManager:
         # Variables are denoted by a '$' prefix, e.g., '$primary-color'
         return self._active_theme.get(name.lstrip('$'))
 
+    def substitute(self, value: str) -> str:
+        """
+        Replaces the theme variables in a string, e.g. "1px solid $border-color".
+        Unknown variables are left as they are. Results are cached until the
+        theme changes.
+        """
+        if "$" not in value:
+            return value
+        result = self._substituted.get(value)
+        if result is None:
+            theme = self._active_theme
+            parts = list(self._template(value))
+            for i in range(1, len(parts), 2):
+                name = parts[i]
+                parts[i] = str(theme[name]) if name in theme else f"${name}"
+            if len(self._substituted) >= _MAX_CACHED_VALUES:
+                self._substituted.clear()
+            result = self._substituted[value] = "".join(parts)
+        return result
+
+    def variables_in(self, value: str) -> Tuple[str, ...]:
+        """Returns the names of the theme variables a string refers to."""
+        if "$" not in value:
+            return ()
+        return self._template(value)[1::2]
+
+    def _template(self, value: str) -> Tuple[str, ...]:
+        template = self._templates.get(value)
+        if template is None:
+            if len(self._templates) >= _MAX_CACHED_VALUES:
+                self._templates.clear()
+            # Literal text at even indexes, variable names at odd ones.
+            template = self._templates[value] = tuple(_VARIABLE_RE.split(value))
+        return template
+
     def substitute_variables(self, style_dict: Dict) -> Dict:
         """
         Recursively substitutes all theme variables in a style dictionary.
@@ -124,12 +183,7 @@ class ThemeManager:
         substituted_dict = {}
         for key, value in style_dict.items():
             if isinstance(value, str):
-                # Iterate through all theme variables and replace them in the string.
-                # This is more robust than a simple startswith() check.
-                new_value = value
-                for var_name, var_value in self._active_theme.items():
-                    new_value = new_value.replace(f'${var_name}', var_value)
-                substituted_dict[key] = new_value
+                substituted_dict[key] = self.substitute(value)
             elif isinstance(value, dict):
                 # Recurse for nested dictionaries (e.g., hover states)
                 substituted_dict[key] = self.substitute_variables(value)
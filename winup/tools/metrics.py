@@ -0,0 +1,214 @@
+"""
+A small metrics registry: counters, gauges and latency histograms.
+
+Metrics are numeric and cheap to update: an update takes a lock held for a
+few instructions, so it is safe from `tasks.run` worker threads, and is
+skipped entirely while the registry is disabled. Histograms count samples in
+fixed buckets, so memory stays constant however many samples are recorded,
+and percentiles are estimated by interpolating within the bucket.
+
+The whole registry can be exported as a dict/JSON or in the Prometheus text
+exposition format.
+"""
+import bisect
+import json
+import math
+import re
+import threading
+from typing import Dict, Optional, Sequence
+
+# Bucket upper bounds in milliseconds, from sub-millisecond widget updates
+# to multi-second loads.
+DEFAULT_LATENCY_BUCKETS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+class Counter:
+    """A value that only goes up, e.g. the number of cache hits."""
+    kind = "counter"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str = ""):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+    def to_dict(self) -> dict:
+        return {"type": self.kind, "value": self.value}
+
+
+class Gauge(Counter):
+    """A value that goes up and down, e.g. the number of pooled widgets."""
+    kind = "gauge"
+
+    def set(self, value: float):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self.value = value
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+
+class Histogram:
+    """
+    A distribution of samples in fixed buckets, e.g. render times in
+    milliseconds. Percentiles are estimates accurate to the bucket width.
+    """
+    kind = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str = "",
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        if list(buckets) != sorted(buckets):
+            raise ValueError(f"Histogram '{name}': bucket bounds must be sorted.")
+        self._registry = registry
+        self._lock = threading.Lock()
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def observe(self, value: float):
+        if not self._registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def reset(self):
+        with self._lock:
+            # One count per bucket, plus one for values above the last bound.
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.min = math.inf
+            self.max = -math.inf
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimates the q-th percentile (0-100), or None without samples."""
+        with self._lock:
+            counts, count, low, high = list(self.counts), self.count, self.min, self.max
+        if not count:
+            return None
+        rank = q / 100 * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else low
+                upper = self.buckets[index] if index < len(self.buckets) else high
+                lower, upper = max(lower, low), min(upper, high)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return high
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.kind,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+# Name prefix of the metrics WinUp records itself, e.g. "winup.memo_hits".
+INTERNAL_PREFIX = "winup."
+
+
+class MetricsRegistry:
+    """Creates metrics by name and exports them."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "",
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def _get(self, cls, name: str, help: str, **options):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(self, name, help, **options)
+        if type(metric) is not cls:
+            raise TypeError(f"Metric '{name}' is a {metric.kind}, not a {cls.kind}.")
+        return metric
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def __iter__(self):
+        return iter(list(self._metrics.values()))
+
+    def reset(self):
+        """Resets every metric to zero, keeping the registered metrics."""
+        for metric in self:
+            metric.reset()
+
+    def to_dict(self) -> dict:
+        return {metric.name: metric.to_dict() for metric in self}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "winup_") -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format. Names
+        get `prefix`, except WinUp's own metrics, which are already prefixed.
+        """
+        lines = []
+        for metric in self:
+            name = re.sub(r"[^a-zA-Z0-9_:]", "_", metric.name)
+            if not metric.name.startswith(INTERNAL_PREFIX):
+                name = prefix + name
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                cumulative = 0
+                for bound, count in zip([*metric.buckets, "+Inf"], metric.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum {metric.sum}")
+                lines.append(f"{name}_count {metric.count}")
+            else:
+                lines.append(f"{name} {metric.value}")
+        return "\n".join(lines) + "\n"
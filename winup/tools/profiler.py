@@ -1,48 +1,312 @@
 import time
+import json
 import functools
+from contextlib import contextmanager
+
+from .metrics import INTERNAL_PREFIX, MetricsRegistry
+
+class _Node:
+    """One call path in a render profile."""
+    __slots__ = ("name", "count", "total", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.children = {}
+
+    @property
+    def self_time(self) -> float:
+        return self.total - sum(child.total for child in self.children.values())
+
+class RenderProfile:
+    """
+    A recording of component renders, widget creation and style application,
+    as a call tree with counts, cumulative and self times (in milliseconds),
+    plus the raw timeline for flame graph viewers.
+    """
+
+    def __init__(self):
+        self.root = _Node("(root)")
+        self.start = time.perf_counter()
+        self.end = None
+        self._stack = [self.root]
+        self._starts = []
+        self._frames = {}
+        self._events = []
+
+    def enter(self, name: str):
+        now = time.perf_counter()
+        parent = self._stack[-1]
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = _Node(name)
+        node.count += 1
+        self._stack.append(node)
+        self._starts.append(now)
+        frame = self._frames.setdefault(name, len(self._frames))
+        self._events.append(("O", frame, now))
+
+    def exit(self):
+        now = time.perf_counter()
+        node = self._stack.pop()
+        node.total += (now - self._starts.pop()) * 1000
+        self._events.append(("C", self._frames[node.name], now))
+
+    def stop(self):
+        self.end = time.perf_counter()
+        self.root.total = (self.end - self.start) * 1000
+
+    def tree(self, node: _Node = None) -> dict:
+        """Returns the call tree as nested dicts."""
+        node = node or self.root
+        return {
+            "name": node.name,
+            "count": node.count,
+            "total_ms": round(node.total, 4),
+            "self_ms": round(node.self_time, 4),
+            "children": [self.tree(child) for child in sorted(node.children.values(), key=lambda c: -c.total)],
+        }
+
+    def stats(self) -> dict:
+        """Aggregates the tree by name: {'name': {'count', 'total_ms', 'self_ms'}}."""
+        stats = {}
+
+        def visit(node, active):
+            entry = stats.setdefault(node.name, {"count": 0, "total_ms": 0.0, "self_ms": 0.0})
+            entry["count"] += node.count
+            entry["self_ms"] += node.self_time
+            # Recursive calls are already included in the outer call's total.
+            if node.name not in active:
+                entry["total_ms"] += node.total
+            for child in node.children.values():
+                visit(child, active | {node.name})
+
+        for child in self.root.children.values():
+            visit(child, frozenset())
+        return dict(sorted(stats.items(), key=lambda item: -item[1]["self_ms"]))
+
+    def print_tree(self, min_ms: float = 0.0):
+        """Prints the call tree, skipping calls that took less than `min_ms` in total."""
+        print(f"{'total ms':>10} {'self ms':>10} {'count':>7}  name")
+
+        def visit(node, depth):
+            for child in sorted(node.children.values(), key=lambda c: -c.total):
+                if child.total < min_ms:
+                    continue
+                print(f"{child.total:10.3f} {child.self_time:10.3f} {child.count:7d}  {'  ' * depth}{child.name}")
+                visit(child, depth + 1)
+
+        visit(self.root, 0)
+
+    def to_speedscope(self, path: str = None, name: str = "WinUp render") -> dict:
+        """
+        Returns the timeline in speedscope's evented format
+        (https://www.speedscope.app), and writes it to `path` if given.
+        """
+        end = self.end if self.end is not None else time.perf_counter()
+        frames = sorted(self._frames, key=self._frames.get)
+        events = [
+            {"type": kind, "frame": frame, "at": round((at - self.start) * 1000, 6)}
+            for kind, frame, at in self._events
+        ]
+        # Close calls still open when the profile was taken.
+        for node in reversed(self._stack[1:]):
+            events.append({"type": "C", "frame": self._frames[node.name], "at": round((end - self.start) * 1000, 6)})
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [{
+                "type": "evented",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round((end - self.start) * 1000, 6),
+                "events": events,
+            }],
+            "exporter": "winup",
+        }
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(document, f)
+        return document
 
 class Profiler:
     def __init__(self):
-        self.results = {}
-        self.memo_hits = 0
-        self.memo_misses = 0
+        # Counters, gauges and histograms; see `winup.tools.metrics`.
+        # WinUp's own metrics are prefixed, so they never clash with the names
+        # of user metrics or `@measure`d functions.
+        self.metrics = MetricsRegistry()
+        internal = INTERNAL_PREFIX
+        self._memo_hits = self.metrics.counter(internal + "memo_hits", "Memoized component cache hits")
+        self._memo_misses = self.metrics.counter(internal + "memo_misses", "Memoized component cache misses")
+        self._memo_evictions = self.metrics.counter(internal + "memo_evictions", "Memo cache entries evicted")
+        self._repolishes = self.metrics.counter(internal + "style_repolishes", "Widgets repolished")
+        self._repolishes_skipped = self.metrics.counter(internal + "style_repolishes_skipped", "Repolishes skipped")
+        self._stalls = self.metrics.counter(internal + "ui_stalls", "Periods in which the event loop was blocked")
+        self._stall_time = self.metrics.histogram(internal + "ui_stall_ms", "Duration of UI stalls in milliseconds")
+        # Names of the histograms filled by @measure
+        self._measured = []
+        # The render profile being recorded, checked by the instrumented code paths
+        self.render_profile = None
+        self.last_render_profile = None
+        # The StallWatchdog started by start_watchdog()
+        self.watchdog = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.metrics.enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        """While disabled, metrics and `@measure` record nothing."""
+        self.metrics.enabled = value
+
+    memo_hits = property(lambda self: self._memo_hits.value)
+    memo_misses = property(lambda self: self._memo_misses.value)
+    memo_evictions = property(lambda self: self._memo_evictions.value)
+    repolishes = property(lambda self: self._repolishes.value)
+    repolishes_skipped = property(lambda self: self._repolishes_skipped.value)
 
     def record_memo_hit(self):
-        self.memo_hits += 1
+        self._memo_hits.inc()
 
     def record_memo_miss(self):
-        self.memo_misses += 1
+        self._memo_misses.inc()
+
+    def record_memo_eviction(self):
+        self._memo_evictions.inc()
 
-    def measure(self, func_name=None):
+    def reset_memo_stats(self):
+        self._memo_hits.reset()
+        self._memo_misses.reset()
+        self._memo_evictions.reset()
+
+    def record_repolish(self):
+        self._repolishes.inc()
+
+    def record_repolish_skipped(self):
+        self._repolishes_skipped.inc()
+
+    def record_stall(self, stall):
+        self._stalls.inc()
+        self._stall_time.observe(stall.duration_ms)
+
+    @property
+    def stalls(self) -> list:
+        """The UI stalls recorded by the watchdog, oldest first."""
+        return list(self.watchdog.stalls) if self.watchdog is not None else []
+
+    @property
+    def results(self) -> dict:
+        """Summaries of the functions timed with `@measure`: count, mean and percentiles in ms."""
+        results = {}
+        for name in self._measured:
+            summary = self.metrics.get(name).to_dict()
+            results[name] = {key: summary[key] for key in ("count", "mean", "p50", "p95", "p99", "max")}
+        return results
+
+    def measure(self, func_name=None, log: bool = False):
         """
         A decorator to measure the execution time of a function.
-        Results are stored in the 'results' dictionary.
+        Every call is recorded in a latency histogram (in milliseconds) named
+        after the function, see `results` and `metrics`. With `log=True`,
+        each call's time is also printed.
         """
         def decorator(func):
+            name = func_name or func.__name__
+            histogram = self.metrics.histogram(name, f"Execution time of {name} in milliseconds")
+            if name not in self._measured:
+                self._measured.append(name)
+
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                name = func_name or func.__name__
+                if not self.metrics.enabled:
+                    return func(*args, **kwargs)
                 start_time = time.perf_counter()
-                result = func(*args, **kwargs)
-                end_time = time.perf_counter()
-                execution_time = (end_time - start_time) * 1000  # in milliseconds
-                
-                self.results[name] = f"{execution_time:.4f} ms"
-                print(f"Profiled '{name}': {execution_time:.4f} ms")
-                
-                return result
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    execution_time = (time.perf_counter() - start_time) * 1000  # in milliseconds
+                    histogram.observe(execution_time)
+                    if log:
+                        print(f"Profiled '{name}': {execution_time:.4f} ms")
             return wrapper
         return decorator
 
+    def to_json(self, **kwargs) -> str:
+        """Exports all metrics as JSON."""
+        return self.metrics.to_json(**kwargs)
+
+    def to_prometheus(self) -> str:
+        """Exports all metrics in the Prometheus text format."""
+        return self.metrics.to_prometheus()
+
+    def start_watchdog(self, threshold_ms: float = 200, sample_interval_ms: float = 10, on_stall=None):
+        """
+        Starts watching the Qt event loop for stalls: periods of more than
+        `threshold_ms` in which it processed no events. While the loop is
+        blocked, the main thread's stack is sampled every `sample_interval_ms`,
+        so each recorded stall shows what the UI thread was busy with.
+        `on_stall` is called with each stall, on the watchdog thread.
+        """
+        from .watchdog import StallWatchdog
+        self.stop_watchdog()
+        self.watchdog = StallWatchdog(threshold_ms, sample_interval_ms, on_stall=on_stall)
+        self.watchdog.start()
+        return self.watchdog
+
+    def stop_watchdog(self):
+        """Stops the watchdog. The stalls it recorded stay in `stalls`."""
+        if self.watchdog is not None:
+            self.watchdog.stop()
+
+    def start_render_profile(self) -> RenderProfile:
+        """
+        Starts recording `Component.render`, `create_widget` and
+        `styler.apply_props` calls. Nothing is recorded otherwise.
+        """
+        self.render_profile = RenderProfile()
+        return self.render_profile
+
+    def stop_render_profile(self) -> RenderProfile:
+        """Stops recording and returns the profile (also kept as `last_render_profile`)."""
+        profile, self.render_profile = self.render_profile, None
+        if profile is not None:
+            profile.stop()
+            self.last_render_profile = profile
+        return profile
+
+    @contextmanager
+    def profile_renders(self):
+        """
+        Records the renders inside the `with` block:
+
+            with profiler.profile_renders() as profile:
+                window = MainWindow()
+            profile.print_tree(min_ms=1)
+            profile.to_speedscope("build.speedscope.json")
+        """
+        profile = self.start_render_profile()
+        try:
+            yield profile
+        finally:
+            self.stop_render_profile()
+
     def print_results(self):
         """Prints all stored profiling results."""
         print("\n--- Performance Profile ---")
-        if not self.results and self.memo_hits == 0 and self.memo_misses == 0:
+        stalls = self.stalls
+        if not self.results and self.memo_hits == 0 and self.memo_misses == 0 and self.repolishes == 0 and self.repolishes_skipped == 0 and self.last_render_profile is None and not stalls:
             print("No profiling data has been recorded.")
             return
 
-        for name, timing in self.results.items():
-            print(f"- {name}: {timing}")
+        for name, summary in self.results.items():
+            if summary["count"]:
+                print(
+                    f"- {name}: {summary['count']} calls, mean {summary['mean']:.4f} ms, "
+                    f"p50 {summary['p50']:.4f} ms, p95 {summary['p95']:.4f} ms, p99 {summary['p99']:.4f} ms"
+                )
         
         if self.memo_hits > 0 or self.memo_misses > 0:
             total_lookups = self.memo_hits + self.memo_misses
@@ -51,6 +315,22 @@ class Profiler:
             print(f"- Hits: {self.memo_hits}")
             print(f"- Misses: {self.memo_misses}")
             print(f"- Hit Ratio: {hit_ratio:.2f}%")
+            print(f"- Evictions: {self.memo_evictions}")
+
+        if self.repolishes > 0 or self.repolishes_skipped > 0:
+            print("\n--- Style Repolish ---")
+            print(f"- Repolishes: {self.repolishes}")
+            print(f"- Skipped: {self.repolishes_skipped}")
+
+        if self.last_render_profile is not None:
+            print("\n--- Render Profile (slowest by self time) ---")
+            for name, entry in list(self.last_render_profile.stats().items())[:10]:
+                print(f"- {name}: {entry['self_ms']:.3f} ms self, {entry['total_ms']:.3f} ms total, {entry['count']} calls")
+
+        if stalls:
+            print(f"\n--- UI Stalls ({len(stalls)}, longest first) ---")
+            for stall in sorted(stalls, key=lambda stall: stall.duration_ms, reverse=True)[:5]:
+                print(stall.format(limit=1))
 
         print("-------------------------\n")
 
@@ -0,0 +1,160 @@
+"""
+Detection of UI stalls: periods in which the Qt event loop did not run.
+
+A timer on the main thread records a heartbeat each time the event loop
+gets to it. A background thread checks the heartbeat at a fixed rate; while
+it is overdue, the thread samples the main thread's Python stack with
+`sys._current_frames()`. When the loop comes back after more than
+`threshold_ms`, the episode is recorded as a `Stall` together with the stacks
+seen during it, which point at the handler or render that blocked the loop.
+"""
+import collections
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+Stack = Tuple[str, ...]
+
+
+class Stall:
+    """One period in which the event loop was blocked."""
+
+    def __init__(self, started: float, duration_ms: float, samples: "collections.Counter[Stack]"):
+        self.started = started  # time.time() when the loop last ran
+        self.duration_ms = duration_ms
+        self.samples = samples  # {stack (outermost frame first): times seen}
+
+    def hottest_stack(self) -> Optional[Stack]:
+        """The stack seen most often during the stall."""
+        return self.samples.most_common(1)[0][0] if self.samples else None
+
+    def format(self, limit: int = 3) -> str:
+        """Describes the stall and its most frequent stacks."""
+        total = sum(self.samples.values())
+        lines = [
+            f"UI stall of {self.duration_ms:.0f} ms at "
+            f"{time.strftime('%H:%M:%S', time.localtime(self.started))} ({total} samples)"
+        ]
+        for stack, count in self.samples.most_common(limit):
+            lines.append(f"  {count}/{total} samples:")
+            lines.extend(f"    {frame}" for frame in stack)
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "started": self.started,
+            "duration_ms": self.duration_ms,
+            "samples": [{"stack": list(stack), "count": count} for stack, count in self.samples.most_common()],
+        }
+
+
+class StallWatchdog:
+    """
+    Watches the Qt event loop from a background thread.
+
+    Args:
+        threshold_ms: Minimum time without the event loop running that counts as a stall.
+        sample_interval_ms: How often the main thread's stack is sampled during a stall.
+        heartbeat_ms: Interval of the main-thread timer that proves the loop is running.
+        on_stall: Called with each `Stall`. It runs on the watchdog thread.
+        max_stalls: Number of most recent stalls kept in `stalls`.
+    """
+
+    def __init__(self, threshold_ms: float = 200, sample_interval_ms: float = 10, heartbeat_ms: float = 20,
+                 on_stall: Callable[[Stall], None] = None, max_stalls: int = 100):
+        self.threshold_ms = threshold_ms
+        self.sample_interval_ms = sample_interval_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.on_stall = on_stall
+        self.stalls: "collections.deque[Stall]" = collections.deque(maxlen=max_stalls)
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._timer: Optional[QTimer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """Starts watching. Must be called on the main thread once the QApplication exists."""
+        if self.running:
+            return
+        if QCoreApplication.instance() is None:
+            raise RuntimeError("The stall watchdog needs a QApplication; start it after creating the app.")
+        if threading.get_ident() != self._main_thread_id:
+            raise RuntimeError("The stall watchdog must be started from the main thread.")
+        self._last_beat = time.perf_counter()
+        self._timer = QTimer()
+        self._timer.setInterval(max(1, int(self.heartbeat_ms)))
+        self._timer.timeout.connect(self._beat)
+        self._timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="winup-stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops watching. Stalls recorded so far are kept."""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._timer.stop()
+        self._timer.deleteLater()
+        self._timer = None
+
+    def _beat(self):
+        self._last_beat = time.perf_counter()
+
+    def _watch(self):
+        interval = self.sample_interval_ms / 1000
+        # A beat is overdue once it is late by more than one heartbeat interval.
+        overdue_after = 2 * self.heartbeat_ms / 1000
+        episode_beat = None  # The last beat before the current episode
+        samples = collections.Counter()
+        while not self._stop.wait(interval):
+            beat = self._last_beat
+            if episode_beat is not None and beat != episode_beat:
+                # The loop ran again: the episode is over.
+                self._finish_episode(episode_beat, beat, samples)
+                episode_beat, samples = None, collections.Counter()
+            if time.perf_counter() - beat > overdue_after:
+                episode_beat = beat
+                stack = self._sample()
+                if stack:
+                    samples[stack] += 1
+
+    def _sample(self) -> Optional[Stack]:
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return None
+        return tuple(
+            f"{entry.filename}:{entry.lineno} in {entry.name}"
+            for entry in traceback.extract_stack(frame)
+        )
+
+    def _finish_episode(self, last_beat: float, resumed: float, samples):
+        # The loop was blocked from one heartbeat after the last beat until it resumed.
+        duration_ms = (resumed - last_beat) * 1000 - self.heartbeat_ms
+        if duration_ms < self.threshold_ms:
+            return
+        started = time.time() - (time.perf_counter() - last_beat)
+        stall = Stall(started, duration_ms, samples)
+        self.stalls.append(stall)
+        from .profiler import profiler
+        profiler.record_stall(stall)
+        if self.on_stall is not None:
+            try:
+                self.on_stall(stall)
+            except Exception:
+                traceback.print_exc()
+
+    def report(self) -> List[dict]:
+        """The recorded stalls as dicts, oldest first."""
+        return [stall.to_dict() for stall in list(self.stalls)]
@@ -1,9 +1,14 @@
 from .widgets.frame import Frame
 from .layout_managers import VBox, HBox, StackBox, GridBox
+from .widgets.lazy import lazy_child
+from ..core.scheduler import DEFAULT_BUDGET_MS, build_incrementally
 
-class Column(Frame):
-    """A Frame that arranges child widgets vertically using a VBox layout."""
-    def __init__(self, children: list = None, props: dict = None, parent=None, **kwargs):
+class _Box(Frame):
+    """The shared implementation of Column and Row, a Frame with a box layout."""
+    _layout_class = VBox
+
+    def __init__(self, children: list = None, props: dict = None, parent=None,
+                 incremental: bool = False, budget_ms: float = DEFAULT_BUDGET_MS, **kwargs):
         # Separate frame props from layout props
         frame_props = props.copy() if props else {}
         layout_props = {
@@ -18,55 +23,71 @@ class Column(Frame):
         # Store original props for web conversion
         self.props = props or {}
         
-        self.set_layout(VBox(props=layout_props))
-        if children:
+        self.set_layout(self._layout_class(props=layout_props))
+        self.incremental_build = None
+        # Kept for recycling, which fills the layout the same way
+        self._incremental = (incremental, budget_ms)
+        self._add_children(children)
+
+    def _winup_recycle(self, children: list = None):
+        self._add_children(children)
+
+    def _add_children(self, children):
+        self.incremental_build = None
+        if not children:
+            return
+        incremental, budget_ms = self._incremental
+        if incremental:
+            self.incremental_build = build_incrementally(self, children, self._add_item, budget_ms)
+        else:
             for item in children:
-                if isinstance(item, tuple) and len(item) == 2:
-                    widget, child_props = item
-                    stretch = child_props.get("stretch", 0)
-                    self.add_child(widget, stretch=stretch)
-                else:
-                    self.add_child(item)
+                self._add_item(item)
 
-class Row(Frame):
-    """A Frame that arranges child widgets horizontally using an HBox layout."""
-    def __init__(self, children: list = None, props: dict = None, parent=None, **kwargs):
-        # Separate frame props from layout props
-        frame_props = props.copy() if props else {}
-        layout_props = {
-            "alignment": frame_props.pop("alignment", None),
-            "spacing": frame_props.pop("spacing", None),
-            "margin": frame_props.pop("margin", None)
-        }
-        layout_props = {k: v for k, v in layout_props.items() if v is not None}
-        
-        super().__init__(props=frame_props, parent=parent, **kwargs)
+    def _add_item(self, item):
+        if isinstance(item, tuple) and len(item) == 2:
+            widget, child_props = item
+            stretch = child_props.get("stretch", 0)
+            self.add_child(widget, stretch=stretch)
+        else:
+            self.add_child(item)
 
-        # Store original props for web conversion
-        self.props = props or {}
+class Column(_Box):
+    """
+    A Frame that arranges child widgets vertically using a VBox layout.
 
-        self.set_layout(HBox(props=layout_props))
-        if children:
-            for item in children:
-                if isinstance(item, tuple) and len(item) == 2:
-                    widget, child_props = item
-                    stretch = child_props.get("stretch", 0)
-                    self.add_child(widget, stretch=stretch)
-                else:
-                    self.add_child(item)
+    With `incremental=True`, `children` can be any iterable (e.g. a generator)
+    and is consumed in slices of at most `budget_ms` milliseconds on the event
+    loop, so a large column fills in progressively without freezing the UI.
+    """
+    _layout_class = VBox
+
+class Row(_Box):
+    """
+    A Frame that arranges child widgets horizontally using an HBox layout.
+
+    With `incremental=True`, `children` can be any iterable (e.g. a generator)
+    and is consumed in slices of at most `budget_ms` milliseconds on the event
+    loop, so a large row fills in progressively without freezing the UI.
+    """
+    _layout_class = HBox
 
 class Stack(Frame):
     """
     A Frame that stacks child widgets on top of each other.
     Only one widget is visible at a time.
+
+    A child can also be a factory (such as a component function); it is built
+    the first time it becomes visible. With `dispose_after`, such children are
+    destroyed after being hidden for that many seconds.
     """
-    def __init__(self, children: list = None, props: dict = None, **kwargs):
+    def __init__(self, children: list = None, props: dict = None, dispose_after: float = None, **kwargs):
         super().__init__(props=props, **kwargs)
         
+        self.dispose_after = dispose_after
         self.set_layout(StackBox())
         if children:
             for child in children:
-                self.add_child(child)
+                self.add_child(lazy_child(child, dispose_after))
 
     def set_current_index(self, index: int):
         """Sets the currently visible widget by its index."""
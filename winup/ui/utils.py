@@ -1,10 +1,12 @@
 from PySide6.QtWidgets import QWidget
 from winup.core.component import Component
+from winup.core.pool import release_widget
 
 def clear_layout(layout):
     """
     Removes all widgets from a layout, ensuring that any WinUp Components
-    have their `_unmount` lifecycle hook called.
+    have their `_unmount` lifecycle hook called. If widget pooling is
+    enabled, the removed widgets are recycled.
     """
     if layout is not None:
         while layout.count():
@@ -14,7 +16,7 @@ def clear_layout(layout):
                 # If the child is a Component, call its unmount handler
                 if isinstance(widget, Component):
                     widget._unmount()
-                widget.deleteLater()
+                release_widget(widget)
             else:
                 # If the item is a layout, clear it recursively
                 sub_layout = item.layout()
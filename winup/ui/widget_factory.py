@@ -6,6 +6,9 @@ This allows developers to override default widgets with their own custom impleme
 from PySide6.QtWidgets import QWidget
 from functools import partial
 from winup.style.styler import merge_props, styler
+from winup.core.pool import pool
+from winup.core.reconcile import set_key
+from winup.tools.profiler import profiler
 
 # Default widget implementations
 from .widgets.button import Button as DefaultButton
@@ -106,6 +109,16 @@ def create_widget(name: str, *args, **kwargs):
     Raises:
         ValueError: If the widget name is not found in the registry.
     """
+    profile = profiler.render_profile
+    if profile is None:
+        return _create_widget(name, args, kwargs)
+    profile.enter(f"ui.{name}")
+    try:
+        return _create_widget(name, args, kwargs)
+    finally:
+        profile.exit()
+
+def _create_widget(name: str, args: tuple, kwargs: dict):
     widget_class = _WIDGET_REGISTRY.get(name)
     if not widget_class:
         raise ValueError(f"Widget type '{name}' not found in registry. Have you registered it?")
@@ -123,8 +136,17 @@ def create_widget(name: str, *args, **kwargs):
     if 'tailwind' in kwargs:
         props['tailwind'] = kwargs.pop('tailwind')
 
-    # Create the widget. The widget's __init__ is now responsible for handling all props.
-    widget_instance = widget_class(*args, props=props, **kwargs)
+    # Reuse a released widget with the same class and props if pooling is enabled.
+    pool_key, content = pool.key_for(widget_class, args, kwargs, props)
+    widget_instance = pool.acquire(pool_key, content) if pool_key is not None else None
+    if widget_instance is not None:
+        if "key" in props:
+            set_key(widget_instance, props["key"])
+    else:
+        # Create the widget. The widget's __init__ is now responsible for handling all props.
+        widget_instance = widget_class(*args, props=props, **kwargs)
+        if pool_key is not None:
+            pool.track(widget_instance, pool_key)
     
     # Attach the hooks to the instance itself for the component decorator to find.
     if on_mount_handler:
@@ -2,13 +2,17 @@ from PySide6.QtWidgets import QPushButton
 from PySide6.QtGui import QIcon, QColor
 from PySide6.QtCore import QSize, Qt
 from ... import style
+from ...core.reconcile import connect_handler
 
 class Button(QPushButton):
+    # Arguments a pooled button is reused with (see winup.core.pool)
+    _winup_content_args = ("text", "on_click", "on_click_enabled")
+
     def __init__(self, text: str = "Button", props: dict = None, on_click: callable = None, on_click_enabled: bool = True, **kwargs):
         super().__init__(text, **kwargs)
         
         if on_click and on_click_enabled:
-            self.clicked.connect(on_click)
+            connect_handler(self, "clicked", on_click)
 
         # Store props for web conversion
         self.props = props or {}
@@ -19,6 +23,15 @@ class Button(QPushButton):
     def set_text(self, text: str):
         self.setText(text)
 
+    def _winup_recycle(self, text: str = "Button", on_click: callable = None, on_click_enabled: bool = True):
+        self.setText(text)
+        connect_handler(self, "clicked", on_click if on_click_enabled else None)
+
+    def _winup_patch(self, new: "Button"):
+        # Icons are not among the properties the reconciler compares.
+        self.setIcon(new.icon())
+        self.setIconSize(new.iconSize())
+
     def on_click(self, func: callable):
         """
         Sets the function to be called when the button is clicked.
@@ -30,7 +43,7 @@ class Button(QPushButton):
         except RuntimeError:
             # This is expected if no signals were connected yet.
             pass
-        self.clicked.connect(func)
+        connect_handler(self, "clicked", func)
         return self
 
     def set_icon(self, icon_path: str, size: int = 16, color: str = None):
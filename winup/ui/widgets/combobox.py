@@ -1,5 +1,7 @@
+from PySide6.QtCore import QSignalBlocker
 from PySide6.QtWidgets import QComboBox
 from ... import style
+from ...core.reconcile import connect_handler
 from typing import List, Callable, Optional
 
 class ComboBox(QComboBox):
@@ -9,7 +11,17 @@ class ComboBox(QComboBox):
         if props:
             style.apply_props(self, props)
         if on_change:
-            self.currentTextChanged.connect(on_change)
+            connect_handler(self, "currentTextChanged", on_change)
         
         # Store props for web conversion
-        self.props = props
\ No newline at end of file
+        self.props = props
+
+    def _winup_patch(self, new: "ComboBox"):
+        items = [new.itemText(i) for i in range(new.count())]
+        if items != [self.itemText(i) for i in range(self.count())]:
+            # Replacing the items is not a selection made by the user.
+            blocker = QSignalBlocker(self)
+            self.clear()
+            self.addItems(items)
+            self.setCurrentIndex(new.currentIndex())
+            blocker.unblock()
\ No newline at end of file
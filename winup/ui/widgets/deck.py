@@ -1,20 +1,27 @@
+from typing import Optional
 from PySide6.QtWidgets import QStackedWidget
 from ... import style
+from .lazy import lazy_child
 
 class Deck(QStackedWidget):
     """
     A widget that stacks its children on top of each other, showing only one at a time.
     It's ideal for creating multi-page applications.
+
+    A child can also be a factory (such as a component function); its page is
+    built the first time it becomes current. With `dispose_after`, such pages
+    are destroyed after being hidden for that many seconds.
     """
-    def __init__(self, children: list = None, props: dict = None, **kwargs):
+    def __init__(self, children: list = None, props: dict = None, dispose_after: Optional[float] = None, **kwargs):
         super().__init__(**kwargs)
+        self.dispose_after = dispose_after
         
         if props:
             style.apply_props(self, props)
         
         if children:
             for child in children:
-                self.addWidget(child) 
+                self.addWidget(lazy_child(child, dispose_after))
         
         # Store props for web conversion
         self.props = props
\ No newline at end of file
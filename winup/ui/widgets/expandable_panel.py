@@ -8,12 +8,17 @@ from PySide6.QtCore import (
 )
 from PySide6.QtWidgets import QFrame, QPushButton, QVBoxLayout, QWidget, QLabel, QHBoxLayout, QSizePolicy
 from winup import style
+from .lazy import LazyPage, lazy_child
 
 
 class ExpandablePanel(QWidget):
     """
     A collapsible panel widget. Contains a header button to toggle the visibility
     of a content area. The expansion and collapse are animated.
+
+    Children can also be factories (such as component functions); they are
+    built the first time the panel expands. With `dispose_after`, they are
+    destroyed after the panel has been collapsed for that many seconds.
     """
 
     animationFinished = Signal()
@@ -30,9 +35,11 @@ class ExpandablePanel(QWidget):
         expand_icon: str = "▼",
         collapse_icon: str = "►",
         props: dict = None,
+        dispose_after: float = None,
     ):
         super().__init__(parent)
         self.is_expanded = expanded
+        self.dispose_after = dispose_after
         self._animation_duration = animation_duration
         self._title = title
         self._expand_icon = expand_icon
@@ -79,7 +86,7 @@ class ExpandablePanel(QWidget):
         # Add children to the inner content widget
         if children:
             for child in children:
-                content_layout.addWidget(child)
+                content_layout.addWidget(self._wrap(child))
         
         self.content_area.setMaximumHeight(0) # Start collapsed
         self.main_layout.addWidget(self.content_area)
@@ -104,8 +111,25 @@ class ExpandablePanel(QWidget):
         # If we expanded, allow the content to resize freely.
         if self.is_expanded:
             self.content_area.setMaximumHeight(16777215)  # Set to a large value (essentially no limit)
+        else:
+            for page in self._lazy_pages():
+                page.schedule_dispose()
         self.animationFinished.emit()
 
+    def _wrap(self, child):
+        """Wraps a child factory in a page that is built when the panel expands."""
+        child = lazy_child(child, self.dispose_after, build_on_show=False)
+        if isinstance(child, LazyPage) and self.is_expanded:
+            child.build()
+        return child
+
+    def _lazy_pages(self) -> list:
+        layout = self._content_widget.layout()
+        return [
+            layout.itemAt(i).widget() for i in range(layout.count())
+            if isinstance(layout.itemAt(i).widget(), LazyPage)
+        ]
+
     def setContent(self, widget: QWidget):
         """Sets the widget to be displayed in the content area."""
         layout = self._content_widget.layout()
@@ -113,12 +137,12 @@ class ExpandablePanel(QWidget):
             child = layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
-        layout.addWidget(widget)
+        layout.addWidget(self._wrap(widget))
         self._update_height()
 
     def add_child(self, widget: QWidget):
         """Adds a widget to the content area."""
-        self._content_widget.layout().addWidget(widget)
+        self._content_widget.layout().addWidget(self._wrap(widget))
         self._update_height()
 
     def _update_height(self):
@@ -129,6 +153,10 @@ class ExpandablePanel(QWidget):
     def toggle(self, checked: bool):
         """Toggles the panel's expanded/collapsed state."""
         self.is_expanded = checked
+        if checked:
+            # Build pending children first so the target height includes them.
+            for page in self._lazy_pages():
+                page.build()
         
         icon = self._expand_icon if self.is_expanded else self._collapse_icon
         self.toggle_button.setText(f"{self._title} {icon}")
@@ -3,6 +3,9 @@ from ..layout_managers import VBox, HBox
 from ... import style
 
 class Frame(QFrame):
+    # Arguments a pooled frame is reused with (see winup.core.pool)
+    _winup_content_args = ("children",)
+
     def __init__(self, children: list = None, props: dict = None, parent: QWidget = None, **kwargs):
         # All custom keyword arguments will be treated as style properties.
         # This is a more robust way to handle styling.
@@ -93,6 +96,18 @@ class Frame(QFrame):
             self._on_unmount_handler()
         super().closeEvent(event)
 
+    def _winup_patch(self, new: "Frame"):
+        # The children are reconciled separately; only the hooks move over.
+        if self._on_mount_handler is not None:
+            self._on_mount_handler = new._on_mount_handler
+        self._on_unmount_handler = new._on_unmount_handler
+
+    def _winup_recycle(self, children: list = None):
+        if children:
+            if self.layout() is None:
+                self.set_layout(VBox())
+            self.add_children(children)
+
     def add_children(self, children: list):
         if not children:
             raise ValueError("Cannot add children to a Frame without a list of children.")
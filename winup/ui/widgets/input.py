@@ -3,6 +3,7 @@ import re
 from typing import Union, Callable, Optional
 from PySide6.QtWidgets import QLineEdit
 from ... import style
+from ...core.reconcile import connect_handler
 from ...state import state as global_state
 
 # Pre-compiled regex for common validation types
@@ -13,6 +14,9 @@ VALIDATION_PATTERNS = {
 }
 
 class Input(QLineEdit):
+    # The validation hook connected in __init__ (see winup.core.reconcile)
+    _winup_own_connections = 1
+
     def __init__(self, placeholder="", text="", props=None, validation=None, on_submit: Optional[Callable] = None, on_text_changed: Optional[Callable] = None, **kwargs):
         super().__init__()
         
@@ -43,10 +47,10 @@ class Input(QLineEdit):
         
         # Connect the custom text changed handler if provided
         if text_changed_handler:
-            self.textChanged.connect(text_changed_handler)
+            connect_handler(self, "textChanged", text_changed_handler)
         
         if submit_handler:
-            self.returnPressed.connect(submit_handler)
+            connect_handler(self, "returnPressed", submit_handler)
 
         # Apply any remaining props as styles
         if props:
@@ -81,6 +85,11 @@ class Input(QLineEdit):
     def _on_text_changed(self, text: str):
         self._validate(text)
 
+    def _winup_patch(self, new: "Input"):
+        if self.validation_rule is not new.validation_rule:
+            self.validation_rule = new.validation_rule
+            self._validate(self.text())
+
     def set_text(self, text: str):
         """A more Pythonic alias for setText()."""
         self.setText(text)
@@ -2,6 +2,9 @@ from PySide6.QtWidgets import QLabel
 from ... import style
 
 class Label(QLabel):
+    # Arguments a pooled label is reused with (see winup.core.pool)
+    _winup_content_args = ("text",)
+
     def __init__(self, text: str = "", props: dict = None, bold: bool = False, font_size: int = None, **kwargs):
         super().__init__(text, **kwargs)
         
@@ -25,3 +28,10 @@ class Label(QLabel):
     def set_text(self, text: str):
         """A more Pythonic alias for setText()."""
         self.setText(text)
+
+    def _winup_recycle(self, text: str = ""):
+        self.setText(text)
+
+    def _winup_patch(self, new: "Label"):
+        # The text and styles are compared as Qt properties by the reconciler.
+        pass
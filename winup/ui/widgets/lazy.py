@@ -0,0 +1,96 @@
+from typing import Callable, Optional
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QVBoxLayout, QWidget
+
+from ...core.pool import release_widget
+
+
+class LazyPage(QWidget):
+    """
+    A placeholder page that builds its content from a factory the first time
+    it is shown. Containers that show one page at a time (TabView, Deck, Stack,
+    ExpandablePanel) wrap factories in a LazyPage, so pages the user never
+    opens are never built.
+
+    With `dispose_after` set, the content is destroyed once the page has been
+    hidden for that many seconds, and built again the next time it is shown.
+    """
+
+    def __init__(self, factory: Callable[[], QWidget], dispose_after: Optional[float] = None,
+                 build_on_show: bool = True, parent: QWidget = None):
+        super().__init__(parent)
+        self.factory = factory
+        self.dispose_after = dispose_after
+        self.build_on_show = build_on_show
+        self.content: Optional[QWidget] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self._dispose_timer = None
+        if dispose_after is not None:
+            self._dispose_timer = QTimer(self)
+            self._dispose_timer.setSingleShot(True)
+            self._dispose_timer.setInterval(int(dispose_after * 1000))
+            self._dispose_timer.timeout.connect(self.dispose)
+
+    @property
+    def is_built(self) -> bool:
+        return self.content is not None
+
+    def build(self) -> QWidget:
+        """Builds the content if it has not been built yet and returns it."""
+        self.cancel_dispose()
+        if self.content is None:
+            content = self.factory()
+            if not isinstance(content, QWidget):
+                name = getattr(self.factory, "__name__", repr(self.factory))
+                raise TypeError(
+                    f"Page factory '{name}' must return a QWidget, "
+                    f"but it returned type '{type(content).__name__}'."
+                )
+            self.content = content
+            self.layout().addWidget(content)
+            if self.isVisible():
+                content.show()
+        return self.content
+
+    def dispose(self):
+        """Destroys the content; it is built again the next time the page is shown."""
+        self.cancel_dispose()
+        if self.content is None:
+            return
+        content, self.content = self.content, None
+        self.layout().removeWidget(content)
+        content.close()  # Runs the on_unmount hooks
+        content.setParent(None)
+        release_widget(content)
+
+    def schedule_dispose(self):
+        """Starts the `dispose_after` countdown, if a disposal policy is set."""
+        if self._dispose_timer is not None and self.content is not None:
+            self._dispose_timer.start()
+
+    def cancel_dispose(self):
+        if self._dispose_timer is not None:
+            self._dispose_timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.build_on_show:
+            self.build()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Only a page hidden within its window (e.g. another tab was opened)
+        # is disposed, not one whose window was minimized or hidden.
+        if self.build_on_show and not event.spontaneous() and not self.isVisibleTo(self.window()):
+            self.schedule_dispose()
+
+
+def lazy_child(child, dispose_after: Optional[float] = None, build_on_show: bool = True) -> QWidget:
+    """Returns `child` if it is a widget, or a LazyPage building it if it is a factory."""
+    if isinstance(child, QWidget) or not callable(child):
+        return child
+    return LazyPage(child, dispose_after=dispose_after, build_on_show=build_on_show)
@@ -28,6 +28,10 @@ class ProgressBar(QProgressBar):
         if props:
             style.styler.apply_props(self, props)
         
+    def _winup_patch(self, new: "ProgressBar"):
+        # Range, value and stylesheet are patched as Qt properties.
+        pass
+
     def get_value(self) -> int:
         return self.value()
         
@@ -1,11 +1,12 @@
 from PySide6.QtWidgets import QRadioButton
 from ... import style
+from ...core.reconcile import connect_handler
 
 class RadioButton(QRadioButton):
     def __init__(self, text: str = "RadioButton", props: dict = None, on_toggle: callable = None, **kwargs):
         super().__init__(text, **kwargs)
         if on_toggle:
-            self.toggled.connect(on_toggle)
+            connect_handler(self, "toggled", on_toggle)
         if props:
             style.apply_props(self, props)
         
@@ -24,7 +25,7 @@ class RadioButton(QRadioButton):
             self.toggled.disconnect()
         except RuntimeError:
             pass
-        self.toggled.connect(func)
+        connect_handler(self, "toggled", func)
         return self
 
     def is_checked(self):
@@ -32,4 +33,8 @@ class RadioButton(QRadioButton):
 
     def set_checked(self, checked: bool):
         self.setChecked(checked)
-        return self 
\ No newline at end of file
+        return self
+
+    def _winup_patch(self, new: "RadioButton"):
+        # Text and checked state are patched as Qt properties.
+        pass 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import QSlider
 from PySide6.QtCore import Qt
 from ... import style
+from ...core.reconcile import connect_handler
 
 class Slider(QSlider):
     """A more intuitive slider widget that allows for advanced styling."""
@@ -17,7 +18,7 @@ class Slider(QSlider):
         self.setValue(value)
         
         if on_change:
-            self.valueChanged.connect(on_change)
+            connect_handler(self, "valueChanged", on_change)
             
         if props:
             style.styler.apply_props(self, props)
@@ -58,6 +59,10 @@ class Slider(QSlider):
         if stylesheet:
             self.setStyleSheet(stylesheet)
             
+    def _winup_patch(self, new: "Slider"):
+        self.setOrientation(new.orientation())
+        self.setSingleStep(new.singleStep())
+
     def get_value(self) -> int:
         return self.value()
         
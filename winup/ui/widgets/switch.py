@@ -1,5 +1,6 @@
 from PySide6.QtWidgets import QCheckBox
 from ... import style
+from ...core.reconcile import connect_handler
 from typing import Callable, Optional
 
 class Switch(QCheckBox):
@@ -8,7 +9,7 @@ class Switch(QCheckBox):
         super().__init__(text, **kwargs)
         self.setChecked(is_checked)
         if on_toggle:
-            self.toggled.connect(on_toggle)
+            connect_handler(self, "toggled", on_toggle)
         
         # Apply theme colors
         theme = style.styler.themes._active_theme
@@ -51,3 +52,7 @@ class Switch(QCheckBox):
         
         # Store props for web conversion
         self.props = props
+
+    def _winup_patch(self, new: "Switch"):
+        # The switch look is a stylesheet, which is patched like the text.
+        pass
@@ -1,17 +1,26 @@
 from PySide6.QtWidgets import QTabWidget, QWidget
 from ... import style
-from typing import Dict
+from typing import Callable, Dict, Optional, Union
+from .lazy import lazy_child
 
 class TabView(QTabWidget):
-    def __init__(self, tabs: Dict[str, QWidget], props: dict = None, **kwargs):
+    """
+    A tabbed container. A tab's content can be a widget or a factory (such as
+    a component function) that builds it the first time the tab is opened.
+    With `dispose_after`, pages built from factories are destroyed after being
+    hidden for that many seconds.
+    """
+    def __init__(self, tabs: Dict[str, Union[QWidget, Callable[[], QWidget]]], props: dict = None,
+                 dispose_after: Optional[float] = None, **kwargs):
         super().__init__(**kwargs)
+        self.dispose_after = dispose_after
         for title, widget in tabs.items():
-            self.addTab(widget, title)
+            self.addTab(lazy_child(widget, dispose_after), title)
         if props:
             style.apply_props(self, props)
         
         # Store props for web conversion
         self.props = props
 
-    def add_tab(self, widget: QWidget, label: str):
-        self.addTab(widget, label)
+    def add_tab(self, widget: Union[QWidget, Callable[[], QWidget]], label: str):
+        self.addTab(lazy_child(widget, self.dispose_after), label)
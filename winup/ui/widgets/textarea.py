@@ -21,3 +21,7 @@ class Textarea(QTextEdit):
         
         # Store props for web conversion
         self.props = props
+
+    def _winup_patch(self, new: "Textarea"):
+        # plainText and placeholderText are patched as Qt properties.
+        pass
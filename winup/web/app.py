@@ -3,10 +3,12 @@ from fastapi import FastAPI, Request, WebSocket
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from typing import Optional, Callable
+from typing import Optional, Callable, Union
 import os
 import logging
 import json
+import secrets
+from contextlib import nullcontext
 from uvicorn.config import LOGGING_CONFIG
 
 from ..core.hot_reload import _import_from_string
@@ -25,6 +27,21 @@ class UvicornLogMessageFilter(logging.Filter):
 
 app = FastAPI()
 _RUN_CONFIG = {} # Global to hold config for non-reload mode
+SESSION_COOKIE = "winup_session"
+
+def _session_scope(session_id: Optional[str]):
+    """
+    Returns the state a request or connection works with and a context that
+    routes `state.get`/`state.set` to it. Without sessions this is the shared state.
+    """
+    if not state.sessions_enabled:
+        return state, nullcontext()
+    if not session_id or not state.has_session(session_id):
+        # Session ids are minted by the server; an unknown cookie is not
+        # allowed to pick the id of a new session.
+        session_id = secrets.token_urlsafe(16)
+    session = state.session(session_id)
+    return session, state.use_session(session)
 
 def _configure_app_routes(config: dict):
     """Adds routes to the global 'app' based on the provided config."""
@@ -36,6 +53,8 @@ def _configure_app_routes(config: dict):
     favicon = config.get("favicon")
     app_shell_path = config.get("app_shell_path")
     mode = config.get("mode", "router") # Default to router for older configs
+    if config.get("sessions") is not None and not state.sessions_enabled:
+        state.enable_sessions(**config["sessions"])
 
     main_component_func = None
     router = None
@@ -71,30 +90,37 @@ def _configure_app_routes(config: dict):
             return HTMLResponse("Invalid route configuration: target is not callable.", status_code=500)
 
         script_manager.reset()
-        
-        # --- Render the content ---
-        component_instance = target_component_func()
-        
-        # Check if it's a web component (returns HTML directly) or desktop component (QWidget)
-        if hasattr(component_instance, 'render') and callable(getattr(component_instance, 'render')):
-            # It's a QWidget from desktop component - convert to HTML
-            from .ui.component import component_to_html
-            page_content_html = component_to_html(component_instance)
-        else:
-            # It's already HTML from web component
-            page_content_html = str(component_instance)
-        
-        # --- Handle App Shell with RouterView ---
-        if app_shell_path:
-            app_shell_component = _import_from_string(app_shell_path)
-            shell_html = app_shell_component().render()
-            # Inject the page content into the shell
-            final_html = shell_html.replace("<winup-router-view></winup-router-view>", page_content_html)
-        else:
-            final_html = page_content_html
-            
-        lifecycle_script = script_manager.generate_script()
-        return templates.TemplateResponse("index.html", {"request": request, "title": title, "favicon": favicon, "content": final_html, "lifecycle_script": lifecycle_script})
+
+        # --- Render the content with the state of the browser's session ---
+        session_id = request.cookies.get(SESSION_COOKIE)
+        page_state, scope = _session_scope(session_id)
+        with scope:
+            component_instance = target_component_func()
+
+            # Check if it's a web component (returns HTML directly) or desktop component (QWidget)
+            if hasattr(component_instance, 'render') and callable(getattr(component_instance, 'render')):
+                # It's a QWidget from desktop component - convert to HTML
+                from .ui.component import component_to_html
+                page_content_html = component_to_html(component_instance)
+            else:
+                # It's already HTML from web component
+                page_content_html = str(component_instance)
+
+            # --- Handle App Shell with RouterView ---
+            if app_shell_path:
+                app_shell_component = _import_from_string(app_shell_path)
+                shell_html = app_shell_component().render()
+                # Inject the page content into the shell
+                final_html = shell_html.replace("<winup-router-view></winup-router-view>", page_content_html)
+            else:
+                final_html = page_content_html
+
+            lifecycle_script = script_manager.generate_script()
+            styles = script_manager.generate_styles()
+        response = templates.TemplateResponse("index.html", {"request": request, "title": title, "favicon": favicon, "styles": styles, "content": final_html, "lifecycle_script": lifecycle_script})
+        if page_state is not state and page_state.session_id != session_id:
+            response.set_cookie(SESSION_COOKIE, page_state.session_id, httponly=True, samesite="lax")
+        return response
 
 async def startup_event():
     """Configures routes when the app starts, avoiding import cycles."""
@@ -121,29 +147,52 @@ app.mount("/_winup/static", StaticFiles(directory=static_dir_path), name="static
 async def websocket_endpoint(websocket: WebSocket):
     """The main WebSocket endpoint for state synchronization."""
     await websocket.accept()
-    state.add_web_connection(websocket)
+    # With sessions enabled, the connection works with its browser session's
+    # state; without a session cookie it gets a session of its own.
+    connection_state, scope = _session_scope(websocket.cookies.get(SESSION_COOKIE))
+    connection_state.add_web_connection(websocket)
     try:
-        while True:
-            data = await websocket.receive_json()
-            
-            # --- State updates from client (two-way binding) ---
-            if data.get("type") == "state_set":
-                key, value = data.get("key"), data.get("value")
-                if key:
-                    await state.set(key, value) # Broadcasts to all clients
-            
-            # --- Event triggers from client ---
-            elif data.get("type") == "trigger_event":
-                event_id = data.get("event_id")
-                if event_id:
-                    # Pass a dummy event object for now for signature compatibility
-                    await event_manager.trigger_event(event_id, {})
-
+        with scope:
+            await _handle_messages(websocket, connection_state)
     except Exception:
         # Client disconnected, no need to log this as an error
         pass
     finally:
-        state.remove_web_connection(websocket)
+        connection_state.remove_web_connection(websocket)
+
+async def _handle_messages(websocket: WebSocket, connection_state):
+    """Processes the messages of one client until it disconnects."""
+    while True:
+        data = await websocket.receive_json()
+
+        # --- State updates from client (two-way binding) ---
+        if data.get("type") == "state_set":
+            key, value = data.get("key"), data.get("value")
+            if key:
+                try:
+                    await connection_state.set(key, value) # Broadcasts to the session's clients
+                except ValueError as e:
+                    # E.g. the session's key limit; the client keeps its connection.
+                    await websocket.send_json({"type": "error", "key": key, "message": str(e)})
+
+        # --- Keys bound by the client's page ---
+        elif data.get("type") == "subscribe":
+            keys = data.get("keys")
+            if isinstance(keys, dict):
+                connection_state.subscribe_web_connection(websocket, keys)
+
+        # --- Full value requests (e.g. a patch arrived for an unknown key) ---
+        elif data.get("type") == "state_get":
+            key = data.get("key")
+            if key:
+                connection_state.request_full_value(websocket, key)
+
+        # --- Event triggers from client ---
+        elif data.get("type") == "trigger_event":
+            event_id = data.get("event_id")
+            if event_id:
+                # Pass a dummy event object for now for signature compatibility
+                await event_manager.trigger_event(event_id, {})
 
 def web_run(
     main_component_path: Optional[str] = None,
@@ -155,7 +204,14 @@ def web_run(
     reload: bool = False,
     metadata: Optional[dict] = None,
     router: Optional[str] = None,
+    sessions: Union[bool, dict] = False,
 ):
+    """
+    Starts the web server.
+
+    Set `sessions=True` to give every browser session its own state, or pass
+    a dict of `state.enable_sessions()` options (e.g. `{"idle_timeout": 600}`).
+    """
     if main_component_path and router_path:
         raise ValueError("You cannot provide both 'main_component_path' and 'router_path'.")
     if app_shell_path and not router_path:
@@ -171,6 +227,8 @@ def web_run(
     run_config = {"title": title, "favicon": favicon, "app_shell_path": app_shell_path}
     if metadata:
         run_config["metadata"] = metadata
+    if sessions:
+        run_config["sessions"] = sessions if isinstance(sessions, dict) else {}
         
     if router_path:
         run_config["mode"] = "router"
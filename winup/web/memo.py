@@ -1,36 +1,45 @@
 import functools
+from typing import Callable
 from . import profiler # Will point to the new web profiler
+from ..core.hashing import Uncacheable, make_key
 
 _cache = {}
 _hits = 0
 _misses = 0
 
-def memo(func):
+def memo(func=None, *, key: Callable = None):
     """
     A memoization decorator for WinUp web components.
     
     Caches the component's output based on its arguments. If the component
     is called again with the same arguments, the cached HTML is returned
-    instead of re-rendering it.
+    instead of re-rendering it. Arguments are compared by value; pass `key`
+    to derive the cache key yourself.
     """
+    if func is None:
+        return functools.partial(memo, key=key)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         global _hits, _misses
         
         try:
-            key = (func, args, frozenset(kwargs.items()))
-        except TypeError:
-            key = (func, args, str(kwargs))
+            cache_key = (func, make_key(args, kwargs, key))
+        except Uncacheable:
+            # Arguments that can only be compared by identity bypass the cache.
+            _misses += 1
+            profiler.get_profiler().add_memo_miss()
+            return func(*args, **kwargs)
 
-        if key in _cache:
+        if cache_key in _cache:
             _hits += 1
             profiler.get_profiler().add_memo_hit()
-            return _cache[key]
+            return _cache[cache_key]
         
         _misses += 1
         profiler.get_profiler().add_memo_miss()
         result = func(*args, **kwargs)
-        _cache[key] = result
+        _cache[cache_key] = result
         return result
         
     return wrapper
@@ -1,4 +1,5 @@
 # winup/web/script_manager.py
+import json
 
 class ScriptManager:
     """
@@ -12,6 +13,10 @@ class ScriptManager:
         """Clears all scripts. Called at the start of each web request."""
         self._mount_scripts = {}
         self._unmount_scripts = {}
+        # State keys bound by the rendered page: {'key': broadcast version at render time}
+        self._bound_keys = {}
+        # CSS rules generated for the page, by class name (e.g. Tailwind variants)
+        self._styles = {}
 
     def add_mount_script(self, component_id: str, script: str):
         """Adds an on_mount script for a given component ID."""
@@ -21,20 +26,40 @@ class ScriptManager:
         """Adds an on_unmount script for a given component ID."""
         self._unmount_scripts[component_id] = script
 
+    def add_bound_key(self, key: str, version: int):
+        """Records a state key the page binds, with the state version it was rendered at."""
+        self._bound_keys[key] = version
+
+    def add_style(self, class_name: str, css: str):
+        """Adds the CSS rules of a generated class to the page, once per class."""
+        self._styles.setdefault(class_name, css)
+
+    def generate_styles(self) -> str:
+        """Returns the CSS collected for the page, to be placed in a <style> tag."""
+        # Escape '</' so an arbitrary Tailwind value can never close the
+        # <style> tag; in CSS, '\/' is the same character as '/'.
+        return "\n".join(self._styles.values()).replace("</", "<\\/")
+
     def generate_script(self) -> str:
         """
         Generates the final JavaScript code to be injected into the HTML.
         This code finds the components by ID and executes their hooks.
         It uses a MutationObserver to detect when elements are removed
         from the DOM to fire on_unmount events.
+
+        It also subscribes the page to the state keys it binds, so the server
+        only sends it updates for those keys.
         """
+        # Escape '</' so a key can never close the surrounding <script> tag.
+        keys_json = json.dumps(self._bound_keys).replace("</", "<\\/")
+        subscribe_js = f"window.winup.subscribe({keys_json});\n"
         if not self._mount_scripts and not self._unmount_scripts:
-            return ""
+            return subscribe_js
 
         mount_js = "{\n" + ",\n".join([f'  "{cid}": (element) => {{ {script} }}' for cid, script in self._mount_scripts.items()]) + "\n}"
         unmount_js = "{\n" + ",\n".join([f'  "{cid}": (element) => {{ {script} }}' for cid, script in self._unmount_scripts.items()]) + "\n}"
 
-        return f"""
+        return subscribe_js + f"""
 document.addEventListener('DOMContentLoaded', () => {{
     const mount_hooks = {mount_js};
     const unmount_hooks = {unmount_js};
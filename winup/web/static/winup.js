@@ -1,29 +1,92 @@
 // Basic WebSocket connection and state management
 const ws = new WebSocket(`ws://${location.host}/ws`);
 
-ws.onmessage = (event) => {
-    const data = JSON.parse(event.data);
-    if (data.type === 'state_update') {
-        // Handle one-way data binding updates
-        document.querySelectorAll(`[data-bind-text='${data.key}']`).forEach(el => {
-            el.textContent = data.value;
-        });
-        // Handle two-way data binding updates for input values
-        document.querySelectorAll(`[data-bind-value='${data.key}']`).forEach(el => {
-            if (el.value !== data.value) {
-                el.value = data.value;
-            }
-        });
-        // Handle two-way data binding for checkbox checked status
-         document.querySelectorAll(`[data-bind-checked='${data.key}']`).forEach(el => {
-            if (el.checked !== data.value) {
-                el.checked = data.value;
-            }
-        });
+// Last known value of each state key, needed to apply patches.
+const stateValues = {};
+
+// Applies JSON-Patch style operations ({op, path, value}) to a value.
+const applyPatches = (target, patches) => {
+    for (const patch of patches) {
+        if (patch.path.length === 0) {
+            target = patch.value;
+            continue;
+        }
+        let parent = target;
+        for (const segment of patch.path.slice(0, -1)) {
+            parent = parent[segment];
+        }
+        const last = patch.path[patch.path.length - 1];
+        if (Array.isArray(parent)) {
+            if (patch.op === 'add') parent.splice(last, 0, patch.value);
+            else if (patch.op === 'remove') parent.splice(last, 1);
+            else parent[last] = patch.value;
+        } else {
+            if (patch.op === 'remove') delete parent[last];
+            else parent[last] = patch.value;
+        }
     }
+    return target;
+};
+
+const renderState = (key, value) => {
+    // Handle one-way data binding updates
+    document.querySelectorAll(`[data-bind-text='${key}']`).forEach(el => {
+        el.textContent = value;
+    });
+    // Handle two-way data binding updates for input values
+    document.querySelectorAll(`[data-bind-value='${key}']`).forEach(el => {
+        if (el.value !== value) {
+            el.value = value;
+        }
+    });
+    // Handle two-way data binding for checkbox checked status
+    document.querySelectorAll(`[data-bind-checked='${key}']`).forEach(el => {
+        if (el.checked !== value) {
+            el.checked = value;
+        }
+    });
 };
 
+const handleMessage = (data) => {
+    if (data.type === 'state_batch') {
+        data.messages.forEach(handleMessage);
+    } else if (data.type === 'state_update') {
+        stateValues[data.key] = data.value;
+        renderState(data.key, data.value);
+    } else if (data.type === 'state_patch') {
+        if (!(data.key in stateValues)) {
+            // We never received the full value, so ask the server for it.
+            ws.send(JSON.stringify({ type: 'state_get', key: data.key }));
+            return;
+        }
+        stateValues[data.key] = applyPatches(stateValues[data.key], data.patches);
+        renderState(data.key, stateValues[data.key]);
+    } else if (data.type === 'error') {
+        console.warn(`WinUp: ${data.message}`);
+        // The change was rejected, so show the last value the server sent again.
+        if (data.key in stateValues) {
+            renderState(data.key, stateValues[data.key]);
+        }
+    }
+};
+
+ws.onmessage = (event) => handleMessage(JSON.parse(event.data));
+
+// The state keys this page binds, sent to the server once the socket is open.
+let subscription = null;
+ws.addEventListener('open', () => {
+    if (subscription !== null) {
+        ws.send(JSON.stringify({ type: 'subscribe', keys: subscription }));
+    }
+});
+
 window.winup = {
+    subscribe: (keys) => {
+        subscription = keys;
+        if (ws.readyState === WebSocket.OPEN) {
+            ws.send(JSON.stringify({ type: 'subscribe', keys: keys }));
+        }
+    },
     sendEvent: (eventId, event) => {
         ws.send(JSON.stringify({ type: 'trigger_event', event_id: eventId }));
     },
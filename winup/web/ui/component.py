@@ -1,10 +1,11 @@
 from typing import List, Dict, Any, Optional, Callable
+import functools
 import uuid
 from ..script_manager import script_manager
 from ..py_to_js import transpile_hook
 from ..event_manager import event_manager
 from ...state import state
-from ...style.tailwind import transpile_tailwind
+from ...style.tailwind import BASE, compile_tailwind, rules_to_css, tailwind_class_name
 
 class Component:
     def __init__(self, children: Optional[List['Component']] = None, props: Optional[Dict[str, Any]] = None):
@@ -12,43 +13,59 @@ class Component:
         self.props = props or {}
 
         # --- Handle Tailwind styling ---
+        # (class name, CSS) of rules the page's <style> needs; added on render
+        self._generated_style = None
         tailwind_string = self.props.pop('tailwind', None)
         if tailwind_string:
-            # Transpile tailwind classes to a style dictionary
-            tailwind_styles = transpile_tailwind(tailwind_string, platform='web')
-            
-            # Convert the style dictionary to a CSS string
-            tailwind_css = "; ".join([f"{key}: {value}" for key, value in tailwind_styles.items()])
-            
-            # Merge with existing styles
-            existing_style = self.props.get('style', '')
-            if existing_style and not existing_style.strip().endswith(';'):
-                existing_style += ';'
-            
-            self.props['style'] = f"{existing_style} {tailwind_css}".strip()
+            # Parsed once per class string; the result is cached
+            rules = compile_tailwind(tailwind_string, platform='web')
+
+            if any(selector != BASE for selector in rules):
+                # Variants (hover:, md:, ...) need selectors, so the classes
+                # become a CSS rule in the page's <style> instead of inline styles.
+                class_name = tailwind_class_name(tailwind_string)
+                self._generated_style = (class_name, rules_to_css(f".{class_name}", rules))
+                class_key = 'class_' if 'class_' in self.props else 'class'
+                self.props[class_key] = f"{self.props.get(class_key, '')} {class_name}".strip()
+            elif rules:
+                tailwind_styles = rules[BASE]
+                existing_style = self.props.get('style', '')
+                if isinstance(existing_style, dict):
+                    self.props['style'] = {**existing_style, **tailwind_styles}
+                else:
+                    # Convert the style dictionary to a CSS string
+                    tailwind_css = "; ".join([f"{key}: {value}" for key, value in tailwind_styles.items()])
+
+                    # Merge with existing styles
+                    if existing_style and not existing_style.strip().endswith(';'):
+                        existing_style += ';'
+
+                    self.props['style'] = f"{existing_style} {tailwind_css}".strip()
 
         # --- Handle State Binding ---
+        # {'prop': 'state key'}; the props are filled from the state on every
+        # render, see `_prepare_render`.
+        self._bindings = {}
+
         # `bind_text` for one-way binding to textContent
         bind_text_key = self.props.pop('bind_text', None)
         if bind_text_key:
             self.props['data-bind-text'] = bind_text_key
-            # Set the initial text from the state for the first render
+            # Set the initial text from the state, unless it is given
             if 'text' not in self.props:
-                self.props['text'] = state.get(bind_text_key)
+                self._bindings['text'] = bind_text_key
 
         # `bind_value` for two-way binding on inputs/textareas
         bind_value_key = self.props.pop('bind_value', None)
         if bind_value_key:
             self.props['data-bind-value'] = bind_value_key
-            # Set the initial value from the state
-            self.props['value'] = state.get(bind_value_key)
+            self._bindings['value'] = bind_value_key
 
         # `bind_checked` for two-way binding to a checkbox's checked status
         bind_checked_key = self.props.pop('bind_checked', None)
         if bind_checked_key:
             self.props['data-bind-checked'] = bind_checked_key
-            # Set the initial checked status from the state
-            self.props['checked'] = state.get(bind_checked_key)
+            self._bindings['checked'] = bind_checked_key
 
         # Allow user-defined IDs, otherwise generate one.
         if 'id' in self.props:
@@ -65,6 +82,31 @@ class Component:
         # --- Handle event handlers ---
         self._process_event_handlers()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Components can be built once and rendered into many pages (e.g. by
+        # @memo), so what a page needs from a component is registered on render.
+        render = cls.__dict__.get('render')
+        if render is not None and not getattr(render, '_winup_prepares', False):
+            @functools.wraps(render)
+            def wrapper(self, *args, **kwargs):
+                self._prepare_render()
+                return render(self, *args, **kwargs)
+            wrapper._winup_prepares = True
+            cls.render = wrapper
+
+    def _prepare_render(self):
+        """
+        Adds the component's generated CSS to the page being rendered, fills
+        the bound props from its state and subscribes the page to their keys,
+        at the version the values were read.
+        """
+        if self._generated_style is not None:
+            script_manager.add_style(*self._generated_style)
+        for prop, key in self._bindings.items():
+            self.props[prop] = state.get(key)
+            script_manager.add_bound_key(key, state.broadcast_version(key))
+
     def _process_event_handlers(self):
         """
         Processes event handler props (on_click, etc.), registering Python